@@ -6,8 +6,15 @@ import sys
 import os
 import logging
 import threading
+import json
+import collections
+import queue
+import multiprocessing
+import subprocess
+import urllib.request
 
 from datetime import datetime
+from urllib.parse import urlparse, parse_qs, urlencode
 from zoneinfo import ZoneInfo  # Python 3.9+ for accurate EST time
 
 from selenium import webdriver
@@ -15,7 +22,8 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.common.action_chains import ActionChains
 from selenium.webdriver.chrome.service import Service
-from selenium.common.exceptions import WebDriverException, NoSuchElementException
+from selenium.webdriver.remote.remote_connection import RemoteConnection
+from selenium.common.exceptions import WebDriverException, NoSuchElementException, StaleElementReferenceException
 
 from rich.text import Text
 from rich.table import Table
@@ -43,6 +51,193 @@ MAX_RETRIES = 5
 WAIT_BETWEEN_RETRIES = 180
 RATE_LIMIT_WAIT = 900
 
+# Persistent browser profile so a restarted driver comes back already logged in
+PROFILE_DIR = os.getenv("FB_PROFILE_DIR", os.path.join(os.path.expanduser("~"), ".fbdelete", "brave-profile"))
+SESSION_CHECK_URL = "https://www.facebook.com/me"
+LOGIN_WAIT_TIMEOUT = 900
+
+# Deadlines so a wedged chromedriver can't block a worker forever
+COMMAND_TIMEOUT = 90       # any single WebDriver HTTP command
+PAGE_LOAD_TIMEOUT = 45
+SCRIPT_TIMEOUT = 30
+WATCHDOG_INTERVAL = 20     # seconds between heartbeats
+HEARTBEAT_TIMEOUT = 100    # longer than any legitimate command, which the heartbeat queues behind
+
+# Warm standby drivers for crash recovery (0 disables the pool)
+DRIVER_POOL_SIZE = int(os.getenv("FB_DRIVER_POOL_SIZE", "1"))
+
+# Attach to a browser started with --remote-debugging-port instead of launching one, e.g. "127.0.0.1:9222"
+DEBUGGER_ADDRESS = os.getenv("FB_DEBUGGER_ADDRESS", "")
+DEBUGGER_LAUNCH_TIMEOUT = 30
+
+# Lean mode (opt-in): block thumbnails, video and third-party trackers the deletion loop never needs
+LEAN_MODE = os.getenv("FB_LEAN_MODE", "0") == "1"
+LEAN_BLOCKED_URLS = [
+    "*.jpg*", "*.jpeg*", "*.png*", "*.gif*", "*.webp*",
+    "*.mp4*", "*.webm*", "*.m4a*", "*video*.fbcdn.net/*",
+    "*doubleclick.net/*", "*google-analytics.com/*", "*googletagmanager.com/*",
+    "*connect.facebook.net/*", "*pixel.facebook.com/*",
+]
+# Patterns each page still needs even in lean mode (e.g. captcha images on login)
+LEAN_ALLOWLISTS = {
+    "login": ["*.jpg*", "*.jpeg*", "*.png*", "*.gif*", "*.webp*"],
+    "about": [],
+    "apps": ["*.png*"],
+    "security": [],
+    "suggestions": [],
+    "activity": [],
+    "trash": [],
+    "archive": [],
+}
+
+# Page readiness: wait on DOM conditions after navigation instead of fixed sleeps
+PAGE_READY_TIMEOUT = 20
+PAGE_READY_POLL = 0.25
+LIST_CHANGE_TIMEOUT = 10  # after an in-app sidebar click, how long the old category's rows may linger
+NETWORK_IDLE_MS = 500
+READY_JITTER_FLOOR = (0.5, 1.0)  # (base, spread) human-like minimum per page visit; None disables
+PAGE_READY_SELECTORS = {
+    "about": "[role='main']",
+    "apps": "[role='main'], #content",
+    "security": "[role='main'], #content",
+    "suggestions": "[role='main']",
+    "activity": "[role='main'] [role='list'], [role='main'] [role='navigation']",
+    "trash": "[role='main']",
+    "archive": "[role='main']",
+}
+# Item-list container per page type; element searches are scoped to the first candidate found
+PAGE_SCOPE_SELECTORS = {
+    "activity": ["[role='main'] [role='list']", "[role='main']"],
+    "trash": ["[role='main'] [role='list']", "[role='main']"],
+    "archive": ["[role='main'] [role='list']", "[role='main']"],
+    "about": ["[role='main']"],
+    "apps": ["[role='main']", "#content"],
+    "security": ["[role='main']", "#content"],
+    "suggestions": ["[role='main']"],
+}
+DIALOG_SCOPE = "[role='dialog']"
+ITEM_QUEUE_BATCH = 25     # items drained from the in-page observer queue per batch
+ITEM_QUEUE_SETTLE = 1.0   # wait once for lazy-loaded items before treating the queue as empty
+PREFETCH_LOW_WATER = 10   # scroll the list's tail into view when fewer items than this are queued (0 = off)
+PREFETCH_INTERVAL_MS = 800
+STALL_BATCH_LIMIT = int(os.getenv("FB_STALL_BATCH_LIMIT", "3"))  # batches with only already-tried items before a loop gives up
+ACTION_DIALOG_MS = 4000   # in-page wait for a confirm dialog after clicking an item's control
+ACTION_GONE_MS = 6000     # in-page wait for the item to leave the list after confirming
+ACTION_FLOOR = (1, 1)     # (base, spread) seconds: the least time one item action takes, as random_wait
+ACTION_POLL = 0.5         # tab workers: seconds between checks on a running in-page action (other tabs get the browser)
+# Snackbar/toast texts (lowercase) that confirm a removal when the row itself lingers
+TOAST_LABELS = ["moved to trash", "deleted", "removed", "archived", "unliked", "hidden", "logged out"]
+PASS_MIN_YIELD = 5         # a pass deleting at least this many earns another pass outright
+PASS_HISTORY_FILE = "fbdelete_pass_history.json"  # per-page yields of each pass, from the last run
+STALL_WAIT = 1.5          # pause between stalled batches so a stuck list isn't hammered
+
+# Deep links to activity-log subsections, learned on first click and reused across runs
+ACTIVITY_LOG_URL = "https://www.facebook.com/me/allactivity?entry_point=www_top_menu_button"
+NAV_TABLE_FILE = "fbdelete_nav_table.json"
+# "client" keeps one activity-log tab and switches categories in-app; "reload" always does a driver.get
+NAV_MODE = os.getenv("FB_NAV_MODE", "client")
+# Date slices: "year" or "month" walks each subsection through the log's year/month filters, newest first,
+# so every slice loads a small DOM; "" processes the whole subsection in one list. Month mode probes each
+# year first and skips the empty ones. Needs the subsection's deep link (learned on first visit).
+DATE_SLICE_MODE = os.getenv("FB_DATE_SLICES", "")
+DATE_SLICE_FROM_YEAR = int(os.getenv("FB_DATE_SLICES_FROM", "2004"))
+
+# Selector registry: tag/label specs per page type and kind, with per-subsection overrides.
+# A control matches when its own text contains one of the labels. Bump "version" on changes;
+# SELECTORS_FILE overrides these when it carries the same or a newer version.
+SELECTORS_FILE = os.getenv("FB_SELECTORS_FILE", "fbdelete_selectors.json")
+# Per-alternative hit/miss counts, so the historically winning label is queried alone first
+SELECTOR_STATS_FILE = "fbdelete_selector_stats.json"
+SELECTOR_MIN_SAMPLES = 3  # hits+misses an alternative needs before it is tried on its own
+_UNLIKE_LABELS = ["Unlike", "Remove reaction", "Undo Like"]
+_DELETE_LABELS = ["Delete", "Remove", "Clear", "Move to trash", "Move to archive", "Unsave", "Unfollow", "Hide", "Decline"]
+DEFAULT_SELECTORS = {
+    "version": 3,
+    "pages": {
+        "activity": {
+            "action": [["span", _DELETE_LABELS + _UNLIKE_LABELS]],
+            "confirm": [
+                ["span", ["Delete", "Remove", "Confirm", "Unsave", "Unfollow", "Unlike", "OK", "Proceed"]],
+                ["button", ["Delete", "Remove", "Confirm", "Unlike", "OK"]],
+            ],
+            # The multi-select toolbar action, looked up only inside BULK_TOOLBAR_SELECTORS; keep labels specific
+            "bulk_action": [["span", ["Move to trash"]]],
+            "subsections": {
+                "Likes and reactions": {
+                    "action": [["span", _UNLIKE_LABELS + _DELETE_LABELS]],
+                    "bulk_action": [["span", ["Unlike"]]],
+                },
+                "Pages, page likes and interests": {
+                    "action": [["span", _UNLIKE_LABELS + _DELETE_LABELS]],
+                    "bulk_action": [["span", ["Unlike"]]],
+                },
+            },
+        },
+        "trash": {"action": [["span", ["Delete"]]], "confirm": [["span", ["Delete", "Confirm"]]]},
+        "archive": {"action": [["span", ["Delete", "Remove"]]], "confirm": [["span", ["Delete", "Confirm"]]]},
+        "about": {"action": [["span", ["Edit", "Remove"]]], "confirm": [["span", ["Remove", "Delete", "Save"]]]},
+        "apps": {"action": [["span", ["Remove", "Delete"]]], "confirm": [["span", ["Remove", "Delete", "Confirm"]]]},
+        "security": {"action": [["span", ["Log Out", "Remove"]]]},
+        "suggestions": {"action": [["span", ["Remove", "Delete", "Hide"]]]},
+    },
+}
+
+# Sweeper page specs: one engine (sweep) drives every simple "open page, act on each control" loop.
+# "page" picks the selectors (SELECTORS) and list scope (PAGE_SCOPE_SELECTORS); "pacing" is a PACING key;
+# termination "exhaust" runs one guarded pass until the list is empty, "converge" repeats passes per another_pass.
+PACING = {"normal": (1, 1), "careful": (1, 2)}  # (base, spread) floor per item action, as random_wait
+SWEEP_PAGES = {
+    "apps": {
+        "url": "https://www.facebook.com/settings?tab=applications", "page": "apps", "title": "Apps and websites",
+        "confirm": True, "pacing": "normal", "termination": "exhaust",
+        "item": ("Removed app/website #{n}.", "green"), "summary": ("All apps/websites removed. Total: {n}", "green"),
+    },
+    "security": {
+        "url": "https://www.facebook.com/settings?tab=security", "page": "security", "title": "Login history",
+        "confirm": False, "pacing": "normal", "termination": "exhaust",
+        "item": ("Logged out session/device #{n}.", "cyan"), "summary": ("Login/device history cleared. Total: {n}", "green"),
+    },
+    "suggestions": {
+        "url": "https://www.facebook.com/friends/suggestions", "page": "suggestions", "title": "Friend suggestions",
+        "confirm": False, "pacing": "normal", "termination": "exhaust",
+        "item": ("Removed friend suggestion #{n}.", "yellow"), "summary": ("Friend suggestions cleared. Total: {n}", "green"),
+    },
+    "trash": {
+        "url": "https://www.facebook.com/me/allactivity/trash", "page": "trash", "title": "Trash",
+        "confirm": True, "pacing": "normal", "termination": "converge",
+        "item": ("Trash: deleted item #{n}.", "red"),
+        "pass": ("Trash emptied. Deleted {n} items this pass.", "Trash already empty this pass."),
+    },
+    "archive": {
+        "url": "https://www.facebook.com/me/allactivity/archive", "page": "archive", "title": "Archive",
+        "confirm": True, "pacing": "normal", "termination": "converge",
+        "item": ("Archive: deleted item #{n}.", "red"),
+        "pass": ("Archive cleared. Deleted {n} items this pass.", "Archive already clear this pass."),
+    },
+    "trash_burn": {
+        "url": "https://www.facebook.com/me/allactivity/trash", "page": "trash", "title": "Permanent trash purge",
+        "confirm": True, "pacing": "careful", "termination": "exhaust",
+        "item": ("PERMANENTLY deleted trash item #{n}.", "bold red"),
+        "summary": ("ALL TRASH PERMANENTLY DELETED. Total: {n}", "bold red"),
+    },
+}
+
+# Bulk mode (opt-in): select every loaded activity-log item with the log's own checkboxes and trash them
+# in one toolbar action. The action is only searched for inside the list's toolbar container.
+BULK_MODE = os.getenv("FB_BULK_MODE", "0") == "1"
+BULK_SELECT_ALL_LABELS = ["All", "Select all"]
+BULK_TOOLBAR_SELECTORS = ["[role='main'] [role='toolbar']"]
+
+# Multi-tab subsection processing inside one browser session (1 keeps the sequential path)
+TAB_COUNT = int(os.getenv("FB_TAB_COUNT", "1"))
+# Action budget for the whole run: shared by tabs, split evenly between fleet workers
+ACTIONS_PER_MINUTE = int(os.getenv("FB_ACTIONS_PER_MINUTE", "40"))
+
+# Multi-browser worker fleet: separate processes, each with its own profile copy of the session
+FLEET_WORKERS = int(os.getenv("FB_FLEET_WORKERS", "1"))
+FLEET_CHUNK_ITEMS = 150  # items per work item before the rest of a category goes back on the queue
+FLEET_MAX_HELPERS = 2    # most workers allowed on one category at once (owner + thieves)
+
 # Section Exclusion/Protection
 PROTECTED_SECTIONS = [
     "Photos", "Albums", "Friends", "Connections", "Groups", "Story archive", "Marketplace"
@@ -287,9 +482,30 @@ error_log = []
 actions_log = []
 driver = None
 actions = None
+ACTIVE_PROFILE_SLOT = 0
+ACTIVE_TAB_HANDLE = None
+DRIVER_RECOVERING = False
+LOG_SINK = None
+LEARNED_SINK = None  # fleet workers ship learned_deltas to the coordinator instead of writing the files
+SESSION_COOKIES = []
+lean_applied = {}
+page_ready_times = {}
+action_times = {}  # name -> [count, total ms, max ms] from ACTION_JS
+action_outcomes = collections.Counter()  # how each item action was (or wasn't) verified
+nav_table = {}
+selector_stats = {}
+pass_history = {}
+learned_deltas = {"stats": {}, "passes": {}, "nav": {}}  # learned since the last flush, for merging fleet workers' results
+bulk_unsupported = set()  # subsections whose log has no working multi-select
+sidebar_cache = {}
+scope_cache = {}
+tab_states = {}
+tab_local = threading.local()
+BROWSER_LOCK = threading.Lock()
 
 IS_PAUSED = False
 IS_RUNNING = False
+FLEET_PAUSE = None  # in a fleet worker: the coordinator's pause Event
 CURRENT_SECTION = "START"
 CURRENT_SUBSECTION = ""
 CURRENT_PASS = 1
@@ -533,6 +749,8 @@ class FBDeleteApp(App):
             error_log.append(f"update_tally error: {e} line {sys.exc_info()[-1].tb_lineno}")
 
     async def action_quit(self) -> None:
+        DRIVER_WATCHDOG.stop()
+        DRIVER_POOL.shutdown()
         self.exit(0)
 
     # ============ BUTTON EVENTS =============
@@ -550,15 +768,18 @@ class FBDeleteApp(App):
 
     async def start_deletion(self):
         try:
+            global IS_RUNNING, IS_PAUSED
             if not self.running:
                 self.running = True
                 self.paused = False
+                IS_RUNNING, IS_PAUSED = True, False
                 self.current_action = "Starting process..."
                 await self.reset_timer()
                 await self.update_statusbar()
                 self.deletion_task = asyncio.create_task(self.deletion_main())
             elif self.paused:
                 self.paused = False
+                IS_PAUSED = False
                 self.current_action = "Resuming..."
                 await self.update_statusbar()
             self.query_one(PauseStartBar).paused = self.paused
@@ -567,9 +788,11 @@ class FBDeleteApp(App):
             append_error(f"start_deletion error: {e} line {sys.exc_info()[-1].tb_lineno}")
 
     async def pause_deletion(self):
+        global IS_PAUSED
         try:
             if self.running and not self.paused:
                 self.paused = True
+                IS_PAUSED = True
                 self.current_action = "Paused."
                 await self.update_statusbar()
             self.query_one(PauseStartBar).paused = self.paused
@@ -614,12 +837,18 @@ class FBDeleteApp(App):
     # ============ LOGIC: MAIN DELETION PROCESS =============
 
     async def deletion_main(self):
-        global driver, actions, progress_count, item_delete_counts, actions_log, error_log
+        global driver, actions, progress_count, item_delete_counts, actions_log, error_log, IS_RUNNING, IS_PAUSED
         try:
-            append_action("ACTION REQUIRED: Log in manually in the opened Brave window.", "cyan")
+            append_action("Starting browser. If asked, log in manually in the opened Brave window.", "cyan")
             await self.async_update_logs()
             driver, actions = await asyncio.to_thread(self.robust_driver_start_manual)
-            append_action("Login confirmed. Beginning deletion process...", "green")
+            append_action("Session confirmed. Beginning deletion process...", "green")
+            DRIVER_POOL.fill()
+            DRIVER_WATCHDOG.start()
+            load_nav_table()
+            load_selectors()
+            load_selector_stats()
+            load_pass_history()
             await self.async_update_logs()
             await asyncio.sleep(1)
             await self.remove_profile_info_async()
@@ -627,17 +856,26 @@ class FBDeleteApp(App):
             await self.clear_login_history_async()
             await self.remove_friend_suggestions_async()
             await asyncio.to_thread(go_to_activity_log)
-            idx = 0
-            for main, data in SECTIONS.items():
-                if data.get("skip"): continue
-                for sub in data["sub"]:
-                    if sub in PROTECTED_SUBSECTIONS:
-                        continue
-                    idx += 1
-                    await self.delete_all_in_subsection_async(main, sub, idx, passes=3)
-                    await asyncio.sleep(1)
+            await asyncio.to_thread(report_missing_subsections)
+            if FLEET_WORKERS > 1:
+                await self.delete_subsections_parallel_async(run_fleet, FLEET_WORKERS, "browser workers", passes=3)
+            elif TAB_COUNT > 1:
+                await self.delete_subsections_parallel_async(run_subsections_in_tabs, TAB_COUNT, "tabs", passes=3)
+            else:
+                idx = 0
+                for main, data in SECTIONS.items():
+                    if data.get("skip"): continue
+                    for sub in data["sub"]:
+                        if sub in PROTECTED_SUBSECTIONS:
+                            continue
+                        idx += 1
+                        await self.delete_all_in_subsection_async(main, sub, idx, passes=3)
+                        await asyncio.sleep(1)
             await self.empty_trash_async(passes=3)
             await self.clear_archive_async(passes=3)
+            report_page_ready_times()
+            report_action_times()
+            flush_learned()
             self.current_section = "BURN"
             self.current_action = (
                 "[WARNING] All deletions complete. Ready to permanently erase trash.\n"
@@ -652,6 +890,7 @@ class FBDeleteApp(App):
             append_error(f"deletion_main error: {e} line {sys.exc_info()[-1].tb_lineno}\n{traceback.format_exc()}")
         self.running = False
         self.paused = False
+        IS_RUNNING = IS_PAUSED = False
         await self.update_statusbar()
 
     # ============ LOGIC: BURN/PERMANENT DELETE =============
@@ -683,25 +922,7 @@ class FBDeleteApp(App):
             append_error(f"async_update_logs error: {e} line {sys.exc_info()[-1].tb_lineno}")
 
     def robust_driver_start_manual(self):
-        global driver, actions
-        for attempt in range(MAX_RETRIES):
-            try:
-                options = webdriver.ChromeOptions()
-                options.binary_location = BRAVE_PATH
-                options.add_argument("--start-maximized")
-                options.add_argument("--window-size=1920,1080")
-                service = Service(CHROMEDRIVER_PATH)
-                driver = webdriver.Chrome(service=service, options=options)
-                actions = ActionChains(driver)
-                driver.get("https://www.facebook.com/login")
-                print("\nLog in to Facebook in the opened browser window, then return and press Enter here.")
-                input("After logging in, press Enter to continue...")
-                return driver, actions
-            except Exception as e:
-                append_error(f"Could not start browser. Attempt {attempt+1}/{MAX_RETRIES}\n{traceback.format_exc()}")
-                time.sleep(WAIT_BETWEEN_RETRIES)
-        append_error("[FATAL] Could not start browser after multiple attempts.")
-        sys.exit(1)
+        return robust_driver_start()
 
     async def prompt_input(self, msg):
         append_action(msg, "yellow")
@@ -742,12 +963,32 @@ class FBDeleteApp(App):
 
     async def delete_all_in_subsection_async(self, section_name, subsection_name, idx, passes=3):
         await asyncio.to_thread(delete_all_in_subsection, section_name, subsection_name, idx, passes)
+        # Save learned state per subsection so an interrupted run keeps it
+        await asyncio.to_thread(flush_learned)
         self.current_section = section_name
         self.current_subsection = subsection_name
         self.progress_percent += 3 * 100 / TOTAL_STEPS
         await self.async_update_logs()
         await self.update_statusbar()
 
+    async def delete_subsections_parallel_async(self, runner, count, unit, passes=3):
+        finished = []
+        work = [(idx, main, sub) for idx, (main, sub) in enumerate(ALL_SUBSECTIONS, start=1)]
+        append_action(f"Processing {len(work)} subsections across {count} {unit}...", "cyan")
+        task = asyncio.create_task(asyncio.to_thread(
+            runner, work, count, passes, lambda main, sub: finished.append((main, sub))
+        ))
+        reported = 0
+        while not task.done() or reported < len(finished):
+            await asyncio.sleep(1)
+            while reported < len(finished):
+                self.current_section, self.current_subsection = finished[reported]
+                self.progress_percent += 3 * 100 / TOTAL_STEPS
+                reported += 1
+            await self.async_update_logs()
+            await self.update_statusbar()
+        await task
+
     async def empty_trash_async(self, passes=3):
         await asyncio.to_thread(empty_trash, passes)
         self.current_section = "Trash"
@@ -769,6 +1010,8 @@ def append_action(msg, color="white"):
         actions_log.append((est_time(), msg, color))
         if len(actions_log) > 40:
             actions_log.pop(0)
+        if LOG_SINK:
+            LOG_SINK("action", msg, color)
     except Exception as e:
         print(f"append_action error: {e} line {sys.exc_info()[-1].tb_lineno}")
 
@@ -776,40 +1019,686 @@ def append_error(msg):
     append_action(msg, color="red")
     try:
         error_log.append(msg)
+        if LOG_SINK:
+            LOG_SINK("error", msg, "red")
     except Exception as e:
         print(f"append_error error: {e} line {sys.exc_info()[-1].tb_lineno}")
 
+def profile_dir_for(slot):
+    # Slot 0 is the main profile; standbys get their own dirs since a profile can't be shared live
+    return PROFILE_DIR if slot == 0 else f"{PROFILE_DIR}-standby{slot}"
+
+def build_driver_options(profile_dir=PROFILE_DIR):
+    options = webdriver.ChromeOptions()
+    options.binary_location = BRAVE_PATH
+    options.add_argument("--start-maximized")
+    options.add_argument("--window-size=1920,1080")
+    os.makedirs(profile_dir, exist_ok=True)
+    options.add_argument(f"--user-data-dir={profile_dir}")
+    if LEAN_MODE:
+        options.add_argument("--autoplay-policy=user-gesture-required")
+        options.add_argument("--mute-audio")
+        # Images are blocked per page through CDP (see apply_lean_mode) so login can keep its captcha
+        options.add_experimental_option("prefs", {
+            "profile.default_content_setting_values.sound": 2,
+            "profile.default_content_setting_values.notifications": 2,
+            "profile.default_content_setting_values.geolocation": 2,
+            "profile.default_content_setting_values.media_stream_mic": 2,
+            "profile.default_content_setting_values.media_stream_camera": 2,
+            "profile.default_content_setting_values.automatic_downloads": 2,
+        })
+    return options
+
+def new_chrome(options):
+    """Start chromedriver with per-command deadlines applied."""
+    try:
+        RemoteConnection.set_timeout(COMMAND_TIMEOUT)
+    except Exception:
+        pass
+    drv = webdriver.Chrome(service=Service(CHROMEDRIVER_PATH), options=options)
+    try:
+        config = getattr(drv.command_executor, "_client_config", None)
+        if config is not None:
+            config.timeout = COMMAND_TIMEOUT
+        drv.set_page_load_timeout(PAGE_LOAD_TIMEOUT)
+        drv.set_script_timeout(SCRIPT_TIMEOUT)
+    except Exception as e:
+        append_error(f"new_chrome timeout setup error: {e} line {sys.exc_info()[-1].tb_lineno}")
+    return drv
+
+def kill_driver(drv):
+    """Hard-kill chromedriver and the browser it launched; the blocked command then raises in its worker."""
+    process = getattr(getattr(drv, "service", None), "process", None)
+    if process is None:
+        return
+    try:
+        if os.name == "nt":
+            subprocess.run(["taskkill", "/F", "/T", "/PID", str(process.pid)], capture_output=True)
+        else:
+            if not DEBUGGER_ADDRESS:
+                subprocess.run(["pkill", "-KILL", "-P", str(process.pid)], capture_output=True)
+            process.kill()
+    except Exception as e:
+        append_error(f"kill_driver error: {e} line {sys.exc_info()[-1].tb_lineno}")
+
+class DriverWatchdog:
+    """Heartbeats the live driver on a timer and kills it when it stops answering."""
+    def __init__(self, interval, heartbeat_timeout):
+        self.interval = interval
+        self.heartbeat_timeout = heartbeat_timeout
+        self._stop = threading.Event()
+        self._thread = None
+        self.kills = 0
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _heartbeat(self, drv):
+        answer = {}
+        def _ping():
+            try:
+                answer["ok"] = drv.execute_script("return 1") == 1
+            except Exception:
+                answer["ok"] = False
+        t = threading.Thread(target=_ping, daemon=True)
+        t.start()
+        t.join(self.heartbeat_timeout)
+        return answer.get("ok")
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            drv = driver
+            if drv is None or DRIVER_RECOVERING:
+                continue
+            process = getattr(getattr(drv, "service", None), "process", None)
+            chromedriver_gone = process is not None and process.poll() is not None
+            ok = False if chromedriver_gone else self._heartbeat(drv)
+            if ok is None and drv is driver:
+                # No answer at all: the session is wedged. False means it errored, which the step already sees.
+                self.kills += 1
+                append_error(f"WATCHDOG: browser unresponsive for {self.heartbeat_timeout}s. Killing it so the step restarts.")
+                kill_driver(drv)
+
+DRIVER_WATCHDOG = DriverWatchdog(WATCHDOG_INTERVAL, HEARTBEAT_TIMEOUT)
+
+def driver_answers():
+    try:
+        return driver.execute_script("return 1") == 1
+    except Exception:
+        return False
+
+def debugger_alive(address=None):
+    """True when a browser is answering on the remote debugging address."""
+    address = address or DEBUGGER_ADDRESS
+    try:
+        with urllib.request.urlopen(f"http://{address}/json/version", timeout=2) as resp:
+            return resp.status == 200
+    except Exception:
+        return False
+
+def launch_debuggable_browser():
+    # Started detached from chromedriver so it outlives driver restarts and app restarts
+    port = DEBUGGER_ADDRESS.rsplit(":", 1)[-1]
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    subprocess.Popen(
+        [BRAVE_PATH, f"--remote-debugging-port={port}", f"--user-data-dir={PROFILE_DIR}", "--start-maximized"],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.time() + DEBUGGER_LAUNCH_TIMEOUT
+    while time.time() < deadline:
+        if debugger_alive():
+            return
+        time.sleep(0.5)
+    raise WebDriverException(f"Browser did not open remote debugging on {DEBUGGER_ADDRESS}")
+
+def attach_driver():
+    if not debugger_alive():
+        append_action(f"No browser on {DEBUGGER_ADDRESS}. Launching one for attach mode...", "yellow")
+        launch_debuggable_browser()
+    options = webdriver.ChromeOptions()
+    options.add_experimental_option("debuggerAddress", DEBUGGER_ADDRESS)
+    return new_chrome(options)
+
+def apply_lean_mode(page, drv=None):
+    """Block heavy/third-party requests for the given page type via CDP, minus its allowlist."""
+    drv = drv or driver
+    if not LEAN_MODE or drv is None:
+        return
+    allowed = set(LEAN_ALLOWLISTS.get(page, []))
+    blocked = [pattern for pattern in LEAN_BLOCKED_URLS if pattern not in allowed]
+    try:
+        # Blocking is per tab, so remember what each tab of each driver already has
+        key = (id(drv), drv.current_window_handle)
+        if lean_applied.get(key) == blocked:
+            return
+        drv.execute_cdp_cmd("Network.enable", {})
+        drv.execute_cdp_cmd("Network.setBlockedURLs", {"urls": blocked})
+        lean_applied[key] = blocked
+    except Exception as e:
+        append_error(f"apply_lean_mode error: {e} line {sys.exc_info()[-1].tb_lineno}")
+
+def clear_lean_mode(drv):
+    """Lift the URL blocking from every tab of drv that lean mode touched (an attached browser is the user's own)."""
+    for key in [k for k in lean_applied if k[0] == id(drv)]:
+        try:
+            drv.switch_to.window(key[1])
+            drv.execute_cdp_cmd("Network.setBlockedURLs", {"urls": []})
+        except Exception:
+            pass
+        del lean_applied[key]
+
+def session_is_authenticated(drv):
+    """True when the browser profile already holds a live Facebook session."""
+    try:
+        if "facebook.com" not in drv.current_url:
+            drv.get(SESSION_CHECK_URL)
+        if drv.get_cookie("c_user") is None:
+            return False
+        url = drv.current_url
+        return "/login" not in url and "/checkpoint" not in url
+    except WebDriverException:
+        return False
+
+def wait_for_login(drv):
+    """Poll until the user logs in by hand; False on timeout."""
+    apply_lean_mode("login", drv)
+    drv.get("https://www.facebook.com/login")
+    print("\nLog in to Facebook in the opened browser window. The run continues automatically once you are logged in.")
+    deadline = time.time() + LOGIN_WAIT_TIMEOUT
+    while time.time() < deadline:
+        try:
+            if drv.get_cookie("c_user") is not None:
+                return True
+        except WebDriverException:
+            return False
+        time.sleep(3)
+    return False
+
+def remember_session_cookies(drv):
+    global SESSION_COOKIES
+    try:
+        SESSION_COOKIES = [c for c in drv.get_cookies() if "facebook.com" in c.get("domain", "")]
+    except WebDriverException:
+        pass
+
+def import_session_cookies(drv):
+    drv.get("https://www.facebook.com/")
+    for cookie in SESSION_COOKIES:
+        try:
+            drv.add_cookie({k: v for k, v in cookie.items() if k != "sameSite"})
+        except WebDriverException:
+            continue
+    drv.get(SESSION_CHECK_URL)
+
+def shutdown_driver():
+    # The profile directory is locked while a browser uses it, so the old one must go first
+    global driver, actions
+    if driver is not None:
+        try:
+            if DEBUGGER_ADDRESS:
+                # Only detach; the attached browser keeps its session and caches for the next run
+                clear_lean_mode(driver)
+                driver.service.stop()
+            else:
+                driver.quit()
+        except Exception:
+            pass
+    driver = None
+    actions = None
+
 def robust_driver_start():
     global driver, actions
+    shutdown_driver()
+    profile_dir = profile_dir_for(ACTIVE_PROFILE_SLOT)
     for attempt in range(MAX_RETRIES):
         try:
-            options = webdriver.ChromeOptions()
-            options.binary_location = BRAVE_PATH
-            options.add_argument("--start-maximized")
-            options.add_argument("--window-size=1920,1080")
-            service = Service(CHROMEDRIVER_PATH)
-            driver = webdriver.Chrome(service=service, options=options)
+            if DEBUGGER_ADDRESS:
+                driver = attach_driver()
+            else:
+                driver = new_chrome(build_driver_options(profile_dir))
             actions = ActionChains(driver)
 
-            # --- MANUAL LOGIN ---
-            driver.get("https://www.facebook.com/login")
-            print("\nLog in to Facebook in the opened browser window, then return and press Enter here.")
-            input("After logging in, press Enter to continue...")
-            # --- END MANUAL LOGIN ---
+            if not session_is_authenticated(driver) and SESSION_COOKIES:
+                import_session_cookies(driver)
+            if session_is_authenticated(driver):
+                append_action("Reused saved browser session. No login needed.", "green")
+            elif wait_for_login(driver):
+                append_action(f"Login detected. Session saved to {profile_dir}.", "green")
+            else:
+                raise WebDriverException(f"No Facebook login detected within {LOGIN_WAIT_TIMEOUT}s")
 
+            remember_session_cookies(driver)
             return driver, actions
         except Exception as e:
             append_error(f"Could not start browser. Attempt {attempt+1}/{MAX_RETRIES}\n{traceback.format_exc()}")
+            shutdown_driver()
             time.sleep(WAIT_BETWEEN_RETRIES)
     append_error("[FATAL] Could not start browser after multiple attempts.")
     sys.exit(1)
 
+def launch_standby_driver(slot):
+    drv = new_chrome(build_driver_options(profile_dir_for(slot)))
+    try:
+        if not session_is_authenticated(drv) and SESSION_COOKIES:
+            import_session_cookies(drv)
+        if not session_is_authenticated(drv):
+            raise WebDriverException(f"Standby driver {slot} could not reuse the Facebook session")
+        drv.minimize_window()
+        return drv
+    except Exception:
+        drv.quit()
+        raise
+
+class StandbyDriverPool:
+    """Pre-launched, pre-authenticated drivers that a crashed step can swap in."""
+    def __init__(self, size):
+        self.size = size
+        self._lock = threading.Lock()
+        self._ready = []
+        self._building = set()
+        self._retiring = set()
+        self._closed = False
+
+    def _free_slots(self):
+        taken = {slot for slot, _ in self._ready} | self._building | self._retiring | {ACTIVE_PROFILE_SLOT}
+        free = [slot for slot in range(self.size + 1) if slot not in taken]
+        return free[:max(0, self.size - len(self._ready) - len(self._building))]
+
+    def fill(self):
+        with self._lock:
+            if self._closed or self.size <= 0 or DEBUGGER_ADDRESS:
+                return
+            slots = self._free_slots()
+            self._building.update(slots)
+        for slot in slots:
+            threading.Thread(target=self._build, args=(slot,), daemon=True).start()
+
+    def _build(self, slot):
+        try:
+            drv = launch_standby_driver(slot)
+            with self._lock:
+                if self._closed:
+                    drv.quit()
+                    return
+                self._ready.append((slot, drv))
+            append_action(f"Standby browser #{slot} warmed up.", "cyan")
+        except Exception as e:
+            append_error(f"Standby browser #{slot} failed to start: {e} line {sys.exc_info()[-1].tb_lineno}")
+        finally:
+            with self._lock:
+                self._building.discard(slot)
+
+    def has_ready(self):
+        with self._lock:
+            return bool(self._ready)
+
+    def take(self):
+        while True:
+            with self._lock:
+                if not self._ready:
+                    return None
+                slot, drv = self._ready.pop(0)
+            try:
+                drv.execute_script("return 1")
+                drv.maximize_window()
+                return slot, drv
+            except WebDriverException:
+                self.retire(drv, slot)
+
+    def retire(self, drv, slot):
+        """Quit a dead driver in the background and rebuild a standby on its profile."""
+        with self._lock:
+            self._retiring.add(slot)
+        def _retire():
+            try:
+                if drv is not None:
+                    drv.quit()
+            except Exception:
+                pass
+            with self._lock:
+                self._retiring.discard(slot)
+            self.fill()
+        threading.Thread(target=_retire, daemon=True).start()
+
+    def shutdown(self):
+        with self._lock:
+            self._closed = True
+            ready, self._ready = self._ready, []
+        for _, drv in ready:
+            try:
+                drv.quit()
+            except Exception:
+                pass
+
+DRIVER_POOL = StandbyDriverPool(DRIVER_POOL_SIZE)
+
+def swap_in_standby_driver():
+    global driver, actions, ACTIVE_PROFILE_SLOT
+    taken = DRIVER_POOL.take()
+    if taken is None:
+        return False
+    slot, fresh = taken
+    dead, dead_slot = driver, ACTIVE_PROFILE_SLOT
+    driver, actions, ACTIVE_PROFILE_SLOT = fresh, ActionChains(fresh), slot
+    DRIVER_POOL.retire(dead, dead_slot)
+    append_action(f"Swapped in standby browser #{slot}. Rebuilding the failed one in background.", "cyan")
+    return True
+
+def _replace_driver(cold_wait):
+    if swap_in_standby_driver():
+        return
+    if DEBUGGER_ADDRESS and debugger_alive():
+        append_action(f"Re-attaching to the running browser on {DEBUGGER_ADDRESS}.", "cyan")
+        robust_driver_start()
+        return
+    wait(cold_wait)
+    robust_driver_start()
+    DRIVER_POOL.fill()
+
+def recover_driver(cold_wait=WAIT_BETWEEN_RETRIES, failed_driver=None):
+    """Prefer a warm standby; fall back to waiting and cold-starting a new browser."""
+    global DRIVER_RECOVERING
+    # With several tabs, only the first worker to hit a dead driver replaces it; the rest wait for it
+    if DRIVER_RECOVERING:
+        while DRIVER_RECOVERING:
+            wait(1)
+    elif failed_driver is None or driver is failed_driver:
+        DRIVER_RECOVERING = True
+        try:
+            _replace_driver(cold_wait)
+        finally:
+            DRIVER_RECOVERING = False
+    if getattr(tab_local, "handle", None) is not None:
+        claim_tab()
+
+PAGE_READY_JS = """
+const selector = arguments[0], idleMs = arguments[1];
+if (!window.__fbdNet) {
+    window.__fbdNet = {last: performance.now()};
+    try {
+        new PerformanceObserver(() => { window.__fbdNet.last = performance.now(); })
+            .observe({type: 'resource', buffered: false});
+    } catch (e) {}
+}
+if (document.readyState !== 'complete') return false;
+if (!document.querySelector(selector)) return false;
+return performance.now() - window.__fbdNet.last >= idleMs;
+"""
+
+def wait_for_page_ready(page, jitter=READY_JITTER_FLOOR, timeout=PAGE_READY_TIMEOUT):
+    """Poll until the page's container is present and the network is idle, then apply the jitter floor."""
+    start = time.time()
+    selector = PAGE_READY_SELECTORS.get(page, "body")
+    ready = False
+    while time.time() - start < timeout:
+        try:
+            if driver.execute_script(PAGE_READY_JS, selector, NETWORK_IDLE_MS):
+                ready = True
+                break
+        except WebDriverException:
+            pass
+        wait(PAGE_READY_POLL)
+    elapsed = time.time() - start
+    page_ready_times.setdefault(page, []).append(elapsed)
+    if not ready:
+        append_action(f"[WARN] '{page}' page not ready after {timeout}s. Continuing anyway.", "yellow")
+    if jitter:
+        floor = jitter[0] + random.random() * jitter[1]
+        if floor > elapsed:
+            wait(floor - elapsed)
+    return ready
+
+def open_page(page, url):
+    apply_lean_mode(page)
+    driver.get(url)
+    invalidate_scope()
+    return wait_for_page_ready(page)
+
+def report_page_ready_times():
+    for page, times in page_ready_times.items():
+        append_action(
+            f"Page ready '{page}': avg {sum(times)/len(times):.1f}s, max {max(times):.1f}s over {len(times)} loads.", "cyan"
+        )
+
+def switch_to_tab(handle):
+    global ACTIVE_TAB_HANDLE
+    if ACTIVE_TAB_HANDLE != handle:
+        driver.switch_to.window(handle)
+        ACTIVE_TAB_HANDLE = handle
+
+def claim_tab():
+    """Give this tab worker a window in the current driver (after a driver swap the old handle is gone)."""
+    claimed = {state["handle"] for state in tab_states.values() if state.get("driver_id") == id(driver)}
+    free = [h for h in driver.window_handles if h not in claimed]
+    if free:
+        handle = free[0]
+    else:
+        driver.switch_to.new_window("tab")
+        handle = driver.current_window_handle
+    tab_local.handle = handle
+    tab_local.driver_id = id(driver)
+    tab_states[tab_local.name] = {"handle": handle, "driver_id": id(driver), "subsection": None, "done": 0}
+    global ACTIVE_TAB_HANDLE
+    ACTIVE_TAB_HANDLE = None
+    switch_to_tab(handle)
+
+def tab_sleep(seconds):
+    """Sleep; a tab worker hands the browser to the other tabs meanwhile."""
+    if getattr(tab_local, "handle", None) is None:
+        time.sleep(seconds)
+        return
+    BROWSER_LOCK.release()
+    try:
+        time.sleep(seconds)
+    finally:
+        BROWSER_LOCK.acquire()
+        try:
+            if tab_local.driver_id != id(driver):
+                claim_tab()
+            else:
+                switch_to_tab(tab_local.handle)
+        except WebDriverException:
+            # A dead driver surfaces on the next real command and goes through the retry path
+            pass
+
+class RateBudget:
+    """Spaces actions evenly so all tabs together stay under ACTIONS_PER_MINUTE."""
+    def __init__(self, per_minute):
+        self.interval = 60.0 / per_minute if per_minute > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next = 0.0
+
+    def take(self):
+        with self._lock:
+            now = time.time()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+        if slot > now:
+            tab_sleep(slot - now)
+
+RATE_BUDGET = RateBudget(ACTIONS_PER_MINUTE)
+
+def _tab_worker(name, work, work_lock, passes, on_done):
+    tab_local.name = name
+    BROWSER_LOCK.acquire()
+    try:
+        claim_tab()
+        while True:
+            with work_lock:
+                if not work:
+                    break
+                idx, section, subsection = work.popleft()
+            tab_states[name]["subsection"] = (section, subsection)
+            delete_all_in_subsection(section, subsection, idx, passes)
+            flush_learned()
+            tab_states[name]["done"] += 1
+            on_done(section, subsection)
+    except Exception as e:
+        append_error(f"Tab {name} worker error: {e} line {sys.exc_info()[-1].tb_lineno}\n{traceback.format_exc()}")
+    finally:
+        tab_local.handle = None
+        tab_states[name]["subsection"] = None
+        BROWSER_LOCK.release()
+
+def run_subsections_in_tabs(work_items, tab_count, passes=3, on_done=lambda section, subsection: None):
+    """Process (idx, section, subsection) items across tab_count tabs sharing one session and rate budget."""
+    work = collections.deque(work_items)
+    work_lock = threading.Lock()
+    tab_states.clear()
+    workers = [
+        threading.Thread(target=_tab_worker, args=(f"tab{n+1}", work, work_lock, passes, on_done), daemon=True)
+        for n in range(max(1, min(tab_count, len(work))))
+    ]
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+
+def fleet_worker_main(worker_id, worker_count, cookies, inbox, results, pause):
+    """Fleet worker process: its own browser on a copy of the session, fed tasks by run_fleet."""
+    global PROFILE_DIR, SESSION_COOKIES, DRIVER_POOL, DEBUGGER_ADDRESS, LOG_SINK, LEARNED_SINK, RATE_BUDGET, FLEET_PAUSE
+    PROFILE_DIR = f"{PROFILE_DIR}-worker{worker_id}"
+    SESSION_COOKIES = cookies
+    DEBUGGER_ADDRESS = ""
+    DRIVER_POOL = StandbyDriverPool(0)
+    LOG_SINK = lambda kind, msg, color: results.put(("log", worker_id, kind, (msg, color)))
+    LEARNED_SINK = lambda deltas: results.put(("learned", worker_id, deltas, None))
+    # Every worker acts on the same account, so each gets its share of the budget
+    RATE_BUDGET = RateBudget(ACTIONS_PER_MINUTE / worker_count)
+    FLEET_PAUSE = pause
+    try:
+        robust_driver_start()
+        DRIVER_WATCHDOG.start()
+        load_nav_table()
+        load_selectors()
+        load_selector_stats()
+        load_pass_history()
+        while True:
+            task = inbox.get()
+            if task is None:
+                break
+            result = delete_all_in_subsection(
+                task["section"], task["subsection"], task["idx"], task["passes"],
+                max_items=FLEET_CHUNK_ITEMS, reverse=task["reverse"], cursor=task.get("cursor"),
+            )
+            flush_learned()
+            results.put(("done", worker_id, task, result or {"deleted": 0, "more": False}))
+    except BaseException as e:
+        append_error(f"Fleet worker {worker_id} stopped: {e} line {sys.exc_info()[-1].tb_lineno}")
+    finally:
+        flush_learned()
+        LOG_SINK = None
+        DRIVER_WATCHDOG.stop()
+        shutdown_driver()
+        results.put(("exit", worker_id, None, None))
+
+def run_fleet(work_items, worker_count, passes=3, on_done=lambda section, subsection: None):
+    """Spread (idx, section, subsection) items over worker processes; idle workers steal into large date-sliced categories."""
+    ctx = multiprocessing.get_context("spawn")
+    results = ctx.Queue()
+    pause = ctx.Event()
+    inboxes = {n: ctx.Queue() for n in range(1, worker_count + 1)}
+    procs = {
+        n: ctx.Process(target=fleet_worker_main, args=(n, worker_count, SESSION_COOKIES, inboxes[n], results, pause), daemon=True)
+        for n in inboxes
+    }
+    for p in procs.values():
+        p.start()
+    pending = collections.deque(
+        {"idx": idx, "section": section, "subsection": subsection, "passes": passes, "reverse": False}
+        for idx, section, subsection in work_items
+    )
+    alive, idle, busy = set(procs), set(procs), {}
+    running = collections.Counter()
+    large = set()
+
+    def next_task():
+        if pending:
+            return pending.popleft()
+        for task in busy.values():
+            key = (task["section"], task["subsection"])
+            # Only date-sliced categories can be split: the thief walks the slices oldest first
+            if not (DATE_SLICE_MODE and nav_table.get(nav_key(*key))):
+                continue
+            if key in large and running[key] < FLEET_MAX_HELPERS:
+                return dict(task, reverse=not task["reverse"], cursor=None)
+        return None
+
+    def finish(n, task):
+        busy.pop(n, None)
+        key = (task["section"], task["subsection"])
+        running[key] -= 1
+        return key
+
+    while alive and (pending or busy):
+        # Workers can't see IS_PAUSED; mirror it, and hold back new work while paused
+        if IS_PAUSED:
+            pause.set()
+        else:
+            pause.clear()
+        for n in ([] if IS_PAUSED else sorted(idle & alive)):
+            task = next_task()
+            if task is None:
+                break
+            inboxes[n].put(task)
+            busy[n] = task
+            idle.discard(n)
+            running[(task["section"], task["subsection"])] += 1
+        try:
+            kind, n, payload, result = results.get(timeout=1)
+        except queue.Empty:
+            for n in [n for n in alive if not procs[n].is_alive()]:
+                alive.discard(n)
+                if n in busy:
+                    task = busy[n]
+                    finish(n, task)
+                    pending.appendleft(task)
+            continue
+        if kind == "log":
+            log_kind, (msg, color) = payload, result
+            if log_kind == "error":
+                error_log.append(f"[worker {n}] {msg}")
+            else:
+                append_action(f"[worker {n}] {msg}", color)
+        elif kind == "learned":
+            merge_learned(payload)
+            flush_learned()
+        elif kind == "done":
+            key = finish(n, payload)
+            idle.add(n)
+            item_delete_counts[key] = item_delete_counts.get(key, 0) + result["deleted"]
+            if result["more"]:
+                large.add(key)
+                # The continuation keeps its direction and resumes at the slice it stopped in
+                pending.appendleft(dict(payload, cursor=result.get("cursor")))
+            elif running[key] == 0 and not any((t["section"], t["subsection"]) == key for t in pending):
+                large.discard(key)
+                on_done(*key)
+        elif kind == "exit":
+            alive.discard(n)
+            if n in busy:
+                task = busy[n]
+                finish(n, task)
+                pending.appendleft(task)
+    if pending:
+        append_error(f"Fleet ran out of workers with {len(pending)} work items left.")
+    for n in alive:
+        inboxes[n].put(None)
+    for p in procs.values():
+        p.join(timeout=30)
+
 def random_wait(base=1, spread=2):
     t = max(1.0, base + random.random() * spread)
-    time.sleep(t)
+    tab_sleep(t)
 
 def wait(seconds=2):
-    time.sleep(seconds)
+    tab_sleep(seconds)
 
 def handle_rate_limit():
     append_error(f"RATE LIMIT: Detected possible rate limit. Waiting {RATE_LIMIT_WAIT//60} minutes before retry...")
@@ -818,6 +1707,7 @@ def handle_rate_limit():
 def error_with_retry(func):
     def wrapper(*args, **kwargs):
         for attempt in range(MAX_RETRIES):
+            started_with = driver
             try:
                 return func(*args, **kwargs)
             except Exception as e:
@@ -827,28 +1717,52 @@ def error_with_retry(func):
                     return None
                 if "rate limit" in str(e).lower():
                     handle_rate_limit()
+                    recover_driver(cold_wait=0, failed_driver=started_with)
                 else:
-                    wait(WAIT_BETWEEN_RETRIES)
-                robust_driver_start()
+                    recover_driver(failed_driver=started_with)
     return wrapper
 
+class ProgressGuard:
+    """Per-loop stall guard: each item key is tried once; stalled batches escalate once, then end the loop."""
+    def __init__(self, name, limit=STALL_BATCH_LIMIT, escalate=None):
+        self.name, self.limit, self.escalate = name, limit, escalate
+        self.attempted = set()
+        self.stalled = 0
+        self.escalated = False
+
+    def next_batch(self, hits):
+        """The hits not tried yet ([] on a stalled batch), or None when the loop should stop."""
+        if not hits:
+            return None
+        fresh = [hit for hit in hits if hit["key"] not in self.attempted]
+        if fresh:
+            self.stalled = 0
+            self.attempted.update(hit["key"] for hit in fresh)
+            return fresh
+        self.stalled += 1
+        if self.stalled < self.limit:
+            wait(STALL_WAIT)
+            return []
+        if self.escalate and not self.escalated:
+            append_action(f"[STALL] {self.name}: {len(hits)} item(s) keep coming back. Reloading and retrying once.", "yellow")
+            self.escalated, self.stalled = True, 0
+            self.attempted.clear()
+            self.escalate()
+            return []
+        append_action(f"[STALL] {self.name}: no progress in {self.limit} batches, {len(hits)} item(s) left. Moving on.", "yellow")
+        return None
+
 @error_with_retry
 def remove_profile_info():
-    driver.get("https://www.facebook.com/me/about")
-    random_wait(3, 3)
+    action_sel, confirm_sel = SELECTORS.get("about", "action"), SELECTORS.get("about", "confirm")
+    open_page("about", "https://www.facebook.com/me/about")
     try:
-        elements = driver.find_elements(By.XPATH, "//span[contains(text(),'Edit') or contains(text(),'Remove')]")
+        elements = discover_in_list(action_sel, "about")
         deleted = 0
         for el in elements:
             try:
-                parent = el.find_element(By.XPATH, './ancestor::*[1]')
-                driver.execute_script("arguments[0].scrollIntoView(true);", el)
-                el.click()
-                random_wait(1, 1)
-                confirm = driver.find_elements(By.XPATH, "//span[contains(text(),'Remove') or contains(text(),'Delete') or contains(text(),'Save')]")
-                if confirm:
-                    confirm[0].click()
-                    random_wait(1, 1)
+                if not act_on_item(el, action_sel, confirm_sel):
+                    continue
                 deleted += 1
                 append_action(f"Removed profile info item #{deleted}.", "green")
             except Exception as e:
@@ -860,278 +1774,1075 @@ def remove_profile_info():
 
 @error_with_retry
 def remove_apps_and_websites():
-    driver.get("https://www.facebook.com/settings?tab=applications")
-    random_wait(3, 3)
-    total_removed = 0
-    while True:
-        removed_something = False
-        remove_buttons = driver.find_elements(By.XPATH, "//span[contains(text(),'Remove') or contains(text(),'Delete')]")
-        if not remove_buttons:
-            break
-        for btn in remove_buttons:
-            try:
-                driver.execute_script("arguments[0].scrollIntoView(true);", btn)
-                btn.click()
-                random_wait(1, 2)
-                confirm = driver.find_elements(By.XPATH, "//span[contains(text(),'Remove') or contains(text(),'Delete') or contains(text(),'Confirm')]")
-                if confirm:
-                    confirm[0].click()
-                    random_wait(1, 1)
-                removed_something = True
-                total_removed += 1
-                append_action(f"Removed app/website #{total_removed}.", "green")
-            except Exception as e:
-                append_error(f"remove_apps_and_websites item error: {e} line {sys.exc_info()[-1].tb_lineno}")
-                continue
-        if not removed_something:
-            break
-    append_action(f"All apps/websites removed. Total: {total_removed}", "green")
+    sweep("apps")
 
 @error_with_retry
 def clear_login_history():
-    driver.get("https://www.facebook.com/settings?tab=security")
-    random_wait(3, 3)
-    total_removed = 0
-    while True:
-        removed_something = False
-        logout_buttons = driver.find_elements(By.XPATH, "//span[contains(text(),'Log Out') or contains(text(),'Remove')]")
-        if not logout_buttons:
-            break
-        for btn in logout_buttons:
-            try:
-                driver.execute_script("arguments[0].scrollIntoView(true);", btn)
-                btn.click()
-                random_wait(1, 1)
-                removed_something = True
-                total_removed += 1
-                append_action(f"Logged out session/device #{total_removed}.", "cyan")
-            except Exception as e:
-                append_error(f"clear_login_history item error: {e} line {sys.exc_info()[-1].tb_lineno}")
-                continue
-        if not removed_something:
-            break
-    append_action(f"Login/device history cleared. Total: {total_removed}", "green")
+    sweep("security")
 
 @error_with_retry
 def remove_friend_suggestions():
-    driver.get("https://www.facebook.com/friends/suggestions")
-    random_wait(3, 2)
-    total_removed = 0
-    while True:
-        removed_something = False
-        remove_btns = driver.find_elements(By.XPATH, "//span[contains(text(),'Remove') or contains(text(),'Delete') or contains(text(),'Hide')]")
-        if not remove_btns:
-            break
-        for btn in remove_btns:
-            try:
-                driver.execute_script("arguments[0].scrollIntoView(true);", btn)
-                btn.click()
-                random_wait(1, 1)
-                removed_something = True
-                total_removed += 1
-                append_action(f"Removed friend suggestion #{total_removed}.", "yellow")
-            except Exception as e:
-                append_error(f"remove_friend_suggestions item error: {e} line {sys.exc_info()[-1].tb_lineno}")
-                continue
-        if not removed_something:
-            break
-    append_action(f"Friend suggestions cleared. Total: {total_removed}", "green")
+    sweep("suggestions")
 
 def go_to_activity_log():
-    driver.get("https://www.facebook.com/me/allactivity?entry_point=www_top_menu_button")
-    random_wait(7, 8)
+    open_page("activity", ACTIVITY_LOG_URL)
 
-def subsection_xpath(subsection):
+def nav_key(section, subsection):
+    return f"{section} > {subsection}"
+
+def load_json(path):
+    """A learned-state table from path; {} when it is missing or unreadable."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        append_error(f"load_json {path} error: {e} line {sys.exc_info()[-1].tb_lineno}")
+        return {}
+
+def save_json(path, data):
+    try:
+        # Write-then-rename so an interrupted save never leaves a truncated table
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        os.replace(tmp, path)
+    except Exception as e:
+        append_error(f"save_json {path} error: {e} line {sys.exc_info()[-1].tb_lineno}")
+
+def load_nav_table():
+    global nav_table
+    nav_table = load_json(NAV_TABLE_FILE)
+    return nav_table
+
+def save_nav_table():
+    save_json(NAV_TABLE_FILE, nav_table)
+
+def same_nav_target(expected, actual):
+    """Facebook bounces dead category links back to the activity log root, so compare path + category."""
+    exp, act = urlparse(expected), urlparse(actual)
+    exp_cat = parse_qs(exp.query).get("category_key")
+    return exp.path.rstrip("/") == act.path.rstrip("/") and exp_cat == parse_qs(act.query).get("category_key")
+
+def learn_nav_link(key, url):
+    if same_nav_target(ACTIVITY_LOG_URL, url):
+        return
+    if nav_table.get(key) != url:
+        nav_table[key] = url
+        note_nav_change(key, url)
+
+def forget_nav_link(key):
+    if nav_table.pop(key, None) is not None:
+        note_nav_change(key, None)
+
+def note_nav_change(key, url):
+    """Save a learned (or forgotten, url=None) link; fleet workers leave the file to the coordinator."""
+    if LEARNED_SINK:
+        learned_deltas["nav"][key] = url
+    else:
+        save_nav_table()
+
+ACTIVITY_HEALTH_JS = """
+const path = location.pathname;
+if (!/\\/allactivity/.test(path) || document.readyState !== 'complete') return false;
+if (!document.querySelector("[role='main']") || document.querySelector("form[action*='login']")) return false;
+const text = document.body ? document.body.innerText.slice(0, 5000) : '';
+return !/Something went wrong|This content isn't available|This page isn't available/i.test(text);
+"""
+
+def activity_page_healthy():
+    """True when the open tab is a working activity-log view that can be navigated in-app."""
+    try:
+        return bool(driver.execute_script(ACTIVITY_HEALTH_JS))
+    except WebDriverException:
+        return False
+
+SIDEBAR_MAP_JS = """
+const out = {};
+const selector = "a, [role='link'], [role='tab'], [role='menuitem'], [role='button']";
+const scopes = [...document.querySelectorAll("[role='navigation']"), document];
+for (const scope of scopes) {
+    for (const el of scope.querySelectorAll(selector)) {
+        const text = (el.innerText || '').split('\\n')[0].trim();
+        if (!text || text.length > 80) continue;
+        const key = text.replace(/[\\u2018\\u2019]/g, "'").toLowerCase();
+        if (!(key in out)) out[key] = [el, el.getAttribute('href') || ''];
+    }
+}
+return {token: String(performance.timeOrigin), links: out};
+"""
+
+def normalize_label(label):
+    return label.replace("\u2019", "'").replace("\u2018", "'").strip().lower()
+
+def resolve_sidebar(force=False):
+    """Map every sidebar label to (element, href) in one in-page pass, cached per page load."""
+    token = driver.execute_script("return String(performance.timeOrigin);")
+    if force or token not in sidebar_cache:
+        if len(sidebar_cache) > 20:
+            sidebar_cache.clear()
+        result = driver.execute_script(SIDEBAR_MAP_JS)
+        sidebar_cache[result["token"]] = result["links"]
+        return result["links"]
+    return sidebar_cache[token]
+
+def invalidate_sidebar():
+    sidebar_cache.clear()
+
+def sidebar_lookup(subsection):
+    links = resolve_sidebar()
+    wanted = normalize_label(subsection)
+    entry = links.get(wanted)
+    if entry is None:
+        entry = next((v for k, v in links.items() if k.startswith(wanted)), None)
+    return entry[0] if entry else None
+
+def report_missing_subsections():
+    try:
+        labels = resolve_sidebar(force=True)
+        missing = [
+            f"{main} > {sub}" for (main, sub) in ALL_SUBSECTIONS
+            if normalize_label(sub) not in labels and nav_key(main, sub) not in nav_table
+        ]
+        if missing:
+            append_action(f"Not in the activity-log sidebar (collapsed or absent): {', '.join(missing)}", "yellow")
+    except Exception as e:
+        append_error(f"report_missing_subsections error: {e} line {sys.exc_info()[-1].tb_lineno}")
+
+def click_subsection_link(subsection, attempts=3):
+    for _ in range(attempts):
+        try:
+            target = sidebar_lookup(subsection)
+            if target is None:
+                target = find_subsection_link(subsection)
+            if target is not None:
+                driver.execute_script("arguments[0].scrollIntoView(true);", target)
+                target.click()
+                return True
+            invalidate_sidebar()
+            wait(1.5)
+        except Exception as e:
+            invalidate_sidebar()
+            if not isinstance(e, StaleElementReferenceException):
+                append_error(f"click_subsection_link nav error: {e} line {sys.exc_info()[-1].tb_lineno}")
+            continue
+    return False
+
+def open_subsection(section, subsection):
+    """Enter a subsection in-app, then by learned deep link, then by reloading the activity log."""
+    key = nav_key(section, subsection)
+    if NAV_MODE == "client" and activity_page_healthy():
+        # Stay in the single-page app: keeps its JS runtime and caches warm
+        before, rows = driver.current_url, list_fingerprint()
+        if click_subsection_link(subsection, attempts=1) and entered_subsection(before, rows):
+            learn_nav_link(key, driver.current_url)
+            return True
+    url = nav_table.get(key)
+    if url:
+        if open_page("activity", url) and same_nav_target(url, driver.current_url):
+            return True
+        append_action(f"[{section} > {subsection}] Saved link stopped working. Relearning it...", "yellow")
+        forget_nav_link(key)
+    go_to_activity_log()
+    before, rows = driver.current_url, list_fingerprint()
+    if not (click_subsection_link(subsection) and entered_subsection(before, rows)):
+        return False
+    learn_nav_link(key, driver.current_url)
+    return True
+
+def entered_subsection(before, rows):
+    """After a sidebar click: True once the URL left before for a category and the old rows are gone."""
+    invalidate_scope()
+    wait_for_page_ready("activity")
+    now = driver.current_url
+    if same_nav_target(before, now) or same_nav_target(ACTIVITY_LOG_URL, now):
+        return False
+    # The shell is ready long before the category's rows arrive; don't let the caller drain the old list
+    deadline = time.time() + LIST_CHANGE_TIMEOUT
+    while rows and time.time() < deadline:
+        if list_fingerprint(refresh=True) != rows:
+            invalidate_scope()
+            return True
+        wait(PAGE_READY_POLL)
+    return not rows
+
+def subsection_xpaths(subsection):
     safe_sub = subsection.replace("'", "").strip()
-    xpaths = [
-        f"//span[text()='{subsection}']",
-        f"//span[contains(text(),'{safe_sub}')]",
-        f"//div[text()='{subsection}']",
-        f"//div[contains(text(),'{safe_sub}')]",
-        f"//*[text()='{subsection}']",
-        f"//*[contains(text(),'{safe_sub}')]",
-    ]
-    return "|".join(xpaths)
+    return {
+        "span=": f"//span[text()='{subsection}']",
+        "span~": f"//span[contains(text(),'{safe_sub}')]",
+        "div=": f"//div[text()='{subsection}']",
+        "div~": f"//div[contains(text(),'{safe_sub}')]",
+        "*=": f"//*[text()='{subsection}']",
+        "*~": f"//*[contains(text(),'{safe_sub}')]",
+    }
+
+def subsection_xpath(subsection):
+    return "|".join(subsection_xpaths(subsection).values())
+
+def find_subsection_link(subsection):
+    """Sidebar XPath fallback: the alternative that found this link before goes first, the union only on a miss."""
+    xpaths = subsection_xpaths(subsection)
+    key = f"sidebar||{subsection}"
+    best = preferred_alternative(key, xpaths)
+    if best:
+        found = driver.find_elements(By.XPATH, xpaths[best])
+        if found:
+            record_alternative(key, best, True)
+            return found[0]
+    for name, xpath in xpaths.items():
+        found = driver.find_elements(By.XPATH, xpath)
+        if found:
+            if best:
+                record_alternative(key, best, False)
+            record_alternative(key, name, True)
+            return found[0]
+    return None
+
+def load_selector_stats():
+    global selector_stats
+    selector_stats = load_json(SELECTOR_STATS_FILE)
+    return selector_stats
+
+def save_selector_stats():
+    save_json(SELECTOR_STATS_FILE, selector_stats)
+
+def record_alternative(key, name, hit):
+    for table in (selector_stats, learned_deltas["stats"]):
+        counts = table.setdefault(key, {}).setdefault(name, [0, 0])
+        counts[0 if hit else 1] += 1
+
+def preferred_alternative(key, names):
+    """The alternative with the best hit rate once it has enough samples, or None to query the union."""
+    stats = selector_stats.get(key, {})
+    best, best_rate = None, 0.5
+    for name in names:
+        hits, misses = stats.get(name, (0, 0))
+        if hits + misses >= SELECTOR_MIN_SAMPLES and hits / (hits + misses) > best_rate:
+            best, best_rate = name, hits / (hits + misses)
+    return best
+
+Selector = collections.namedtuple("Selector", "spec xpath labels key")
+
+def spec_xpath(spec):
+    return "|".join(f"//{tag}[contains(text(),'{label}')]" for tag, labels in spec for label in labels)
+
+def compile_selector(spec, key=None):
+    spec = [[tag, list(labels)] for tag, labels in spec]
+    return Selector(spec, spec_xpath(spec), tuple(label for _, labels in spec for label in labels), key)
+
+def selector_stats_key(sel):
+    return "|".join(part or "" for part in sel.key or ("", "", ""))
+
+def preferred_selector(sel):
+    """sel narrowed to its historically winning label, or None when sel has no clear winner."""
+    if len(sel.labels) < 2:
+        return None
+    best = preferred_alternative(selector_stats_key(sel), sel.labels)
+    if best is None:
+        return None
+    spec = [[tag, [best]] for tag, labels in sel.spec if best in labels]
+    return compile_selector(spec, sel.key)
+
+def record_selector_hits(sel, hits):
+    key = selector_stats_key(sel)
+    for label in {hit["label"] for hit in hits}:
+        record_alternative(key, label, True)
+
+def find_ranked(sel, find):
+    """Run find (a Selector -> hit dicts query) with the winning label first, widening to the union on a miss."""
+    preferred = preferred_selector(sel)
+    if preferred:
+        hits = find(preferred)
+        if hits:
+            record_selector_hits(sel, hits)
+            return hits
+    hits = find(sel)
+    if hits:
+        if preferred:
+            record_alternative(selector_stats_key(sel), preferred.labels[0], False)
+        record_selector_hits(sel, hits)
+    return hits
+
+class SelectorRegistry:
+    """Selectors keyed by (page, kind, subsection), compiled once per load; subsection entries override the page's."""
+    def __init__(self, data):
+        self.load(data)
+
+    def load(self, data):
+        compiled = {}
+        for page, kinds in data["pages"].items():
+            for kind, spec in kinds.items():
+                if kind != "subsections":
+                    compiled[(page, kind, None)] = compile_selector(spec, (page, kind, None))
+            for subsection, overrides in kinds.get("subsections", {}).items():
+                for kind, spec in overrides.items():
+                    compiled[(page, kind, subsection)] = compile_selector(spec, (page, kind, subsection))
+        self.version = data.get("version", 0)
+        self._compiled = compiled
+
+    def get(self, page, kind, subsection=None):
+        """Subsection lookups without an override share the page's spec but keep their own hit stats."""
+        sel = self._compiled.get((page, kind, subsection)) or self._compiled[(page, kind, None)]
+        return sel._replace(key=(page, kind, subsection)) if subsection else sel
+
+SELECTORS = SelectorRegistry(DEFAULT_SELECTORS)
+
+def load_selectors():
+    """Use SELECTORS_FILE when it is at least as new as the built-in set; write the defaults out if missing."""
+    try:
+        with open(SELECTORS_FILE, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        try:
+            with open(SELECTORS_FILE, "w", encoding="utf-8") as f:
+                json.dump(DEFAULT_SELECTORS, f, indent=2, ensure_ascii=False)
+        except Exception as e:
+            append_error(f"load_selectors write error: {e} line {sys.exc_info()[-1].tb_lineno}")
+        return
+    except Exception as e:
+        append_error(f"load_selectors error: {e} line {sys.exc_info()[-1].tb_lineno}")
+        return
+    if data.get("version", 0) < DEFAULT_SELECTORS["version"]:
+        append_action(f"[WARN] {SELECTORS_FILE} is older than the built-in selectors (v{data.get('version', 0)}). Ignoring it.", "yellow")
+        return
+    try:
+        # A file may leave out (page, kind) pairs the code needs; those keep their built-in spec
+        missing = []
+        pages = data.setdefault("pages", {})
+        for page, kinds in DEFAULT_SELECTORS["pages"].items():
+            for kind, spec in kinds.items():
+                if kind != "subsections" and kind not in pages.setdefault(page, {}):
+                    pages[page][kind] = spec
+                    missing.append(f"{page}.{kind}")
+        if missing:
+            append_action(f"[WARN] {SELECTORS_FILE} lacks {', '.join(missing)}. Using the built-in selectors for those.", "yellow")
+        SELECTORS.load(data)
+        append_action(f"Loaded selectors v{SELECTORS.version} from {SELECTORS_FILE}.", "cyan")
+    except Exception as e:
+        SELECTORS.load(DEFAULT_SELECTORS)
+        append_error(f"Bad selector file {SELECTORS_FILE}, using built-ins: {e} line {sys.exc_info()[-1].tb_lineno}")
 
 def subsection_action_xpath(subsection):
-    unlike_xpaths = [
-        "//span[contains(text(),'Unlike')]",
-        "//span[contains(text(),'Remove reaction')]",
-        "//span[contains(text(),'Undo Like')]",
-    ]
-    delete_xpaths = [
-        "//span[contains(text(),'Delete')]",
-        "//span[contains(text(),'Remove')]",
-        "//span[contains(text(),'Clear')]",
-        "//span[contains(text(),'Move to trash')]",
-        "//span[contains(text(),'Move to archive')]",
-        "//span[contains(text(),'Unsave')]",
-        "//span[contains(text(),'Unfollow')]",
-        "//span[contains(text(),'Hide')]",
-        "//span[contains(text(),'Decline')]",
-    ]
-    if "like" in subsection.lower() or "reaction" in subsection.lower():
-        return "|".join(unlike_xpaths + delete_xpaths)
-    return "|".join(delete_xpaths + unlike_xpaths)
+    return SELECTORS.get("activity", "action", subsection).xpath
 
 def subsection_confirm_xpath():
-    return ("//span[contains(text(),'Delete')]"
-            "|//span[contains(text(),'Remove')]"
-            "|//span[contains(text(),'Confirm')]"
-            "|//span[contains(text(),'Unsave')]"
-            "|//span[contains(text(),'Unfollow')]"
-            "|//span[contains(text(),'Unlike')]"
-            "|//span[contains(text(),'OK')]"
-            "|//span[contains(text(),'Proceed')]"
-            "|//button[contains(text(),'Delete')]"
-            "|//button[contains(text(),'Remove')]"
-            "|//button[contains(text(),'Confirm')]"
-            "|//button[contains(text(),'Unlike')]"
-            "|//button[contains(text(),'OK')]")
+    return SELECTORS.get("activity", "confirm").xpath
+
+# Shared in-page helpers: label matching on a control's own text, stable item keys, and the hit record.
+# A key is the item's data-id/id, else a hash of the item's text; it is stamped on the control as
+# data-fbd-key so the control can be found again (or its re-rendered twin matched) right before a click.
+JS_HELPERS = """
+function fbdTags(specs) {
+    const byTag = {};
+    for (const [tag, labels] of specs) byTag[tag] = (byTag[tag] || []).concat(labels);
+    return byTag;
+}
+function fbdLabel(byTag, el) {
+    let own = '';
+    for (const n of el.childNodes) if (n.nodeType === 3) own += n.textContent;
+    if (!own) return null;
+    return (byTag[el.tagName.toLowerCase()] || []).find(l => own.includes(l)) || null;
+}
+function fbdBaseKey(el, label) {
+    const item = el.closest("[role='listitem'], [role='article'], [role='row'], li, tr");
+    const id = item && (item.getAttribute('data-id') || item.id);
+    if (id) return label + ':' + id;
+    const text = label + '|' + ((item || el.parentElement || el).innerText || '');
+    let h = 5381;
+    for (let i = 0; i < text.length; i++) h = ((h * 33) ^ text.charCodeAt(i)) >>> 0;
+    return label + ':h' + h.toString(36);
+}
+function fbdStamp(el, key) {
+    let k = key, n = 0;
+    while (document.querySelector('[data-fbd-key="' + CSS.escape(k) + '"]')) k = key + '~' + (++n);
+    el.dataset.fbdKey = k;
+    return k;
+}
+function fbdResolve(specs, key) {
+    let el = document.querySelector('[data-fbd-key="' + CSS.escape(key) + '"]');
+    if (el) return el;
+    // The list re-rendered the item; find an unstamped control with the same base key and adopt it
+    const base = key.replace(/~\\d+$/, '');
+    const byTag = fbdTags(specs);
+    for (const c of document.querySelectorAll(Object.keys(byTag).join(','))) {
+        if (c.dataset.fbdKey) continue;
+        const label = fbdLabel(byTag, c);
+        if (label && fbdBaseKey(c, label) === base) { c.dataset.fbdKey = key; return c; }
+    }
+    return null;
+}
+function fbdHit(el, label) {
+    const r = el.getBoundingClientRect();
+    if (!r.width || !r.height) return null;
+    const key = el.dataset.fbdKey || fbdStamp(el, fbdBaseKey(el, label));
+    const inItem = !!el.closest("[role='listitem'], [role='article'], [role='row'], li, tr");
+    const inLink = !!el.closest('a[href]');
+    return {el: el, label: label, key: key, in_item: inItem, in_link: inLink, rect: {x: r.x, y: r.y, width: r.width, height: r.height}};
+}
+"""
+
+DISCOVER_JS = JS_HELPERS + """
+const specs = arguments[0];
+let scope = arguments[1];
+if (typeof scope === 'string') scope = [...document.querySelectorAll(scope)].pop();
+scope = scope || document;
+const byTag = fbdTags(specs);
+const hits = [];
+for (const el of scope.querySelectorAll(Object.keys(byTag).join(','))) {
+    const label = fbdLabel(byTag, el);
+    const hit = label && fbdHit(el, label);
+    if (hit) hits.push(hit);
+}
+return hits;
+"""
+
+def discover_actionables(spec, scope=None):
+    """Every visible control matching spec in one round trip, as dicts of el/label/key/in_item/in_link/rect."""
+    return driver.execute_script(DISCOVER_JS, spec, scope) or []
+
+def discover_elements(spec, scope=None):
+    return [hit["el"] for hit in discover_actionables(spec, scope)]
+
+SCOPE_JS = """
+for (const css of arguments[0]) {
+    const el = document.querySelector(css);
+    if (el) return el;
+}
+return null;
+"""
+WHOLE_DOCUMENT = "document"
+
+def invalidate_scope():
+    for key in [k for k in scope_cache if k[:2] == (id(driver), ACTIVE_TAB_HANDLE)]:
+        del scope_cache[key]
+
+def list_scope(page, refresh=False):
+    """The page's item-list container (None means the whole document), resolved once per page load."""
+    key = (id(driver), ACTIVE_TAB_HANDLE, page)
+    if refresh or key not in scope_cache:
+        scope_cache[key] = driver.execute_script(SCOPE_JS, PAGE_SCOPE_SELECTORS.get(page, [])) or WHOLE_DOCUMENT
+    scope = scope_cache[key]
+    return None if scope is WHOLE_DOCUMENT else scope
+
+def widen_scope(page):
+    scope_cache[(id(driver), ACTIVE_TAB_HANDLE, page)] = WHOLE_DOCUMENT
+
+def discover_in_list(sel, page):
+    """Discover sel's controls inside the page's item-list container, as hit dicts for act_on_item."""
+    return find_ranked(sel, lambda s: _discover_in_list(s, page))
+
+def _discover_in_list(sel, page):
+    scope = list_scope(page)
+    try:
+        hits = discover_actionables(sel.spec, scope)
+    except StaleElementReferenceException:
+        # The app re-rendered the list; resolve the new container once and search it
+        scope = list_scope(page, refresh=True)
+        hits = discover_actionables(sel.spec, scope)
+    if not hits and scope is not None:
+        # Controls may live outside the container (menus, portals); widen for the rest of this page load
+        hits = discover_actionables(sel.spec)
+        if hits:
+            widen_scope(page)
+    return hits
+
+ITEM_QUEUE_JS = JS_HELPERS + """
+const [specs, scopeArg, key, limit, lowWater, prefetchMs] = arguments;
+const queues = window.__fbdQueues = window.__fbdQueues || {};
+let q = queues[key];
+let installed = false;
+if (!q || !q.scope.isConnected) {
+    if (q) q.observer.disconnect();
+    const scope = scopeArg || document.documentElement;
+    q = {key: key, scope: scope, items: [], seen: new WeakSet(), byTag: fbdTags(specs)};
+    q.css = Object.keys(q.byTag).join(',');
+    const consider = (el) => {
+        if (!el || q.seen.has(el) || !el.matches(q.css)) return;
+        const label = fbdLabel(q.byTag, el);
+        if (!label) return;
+        q.seen.add(el);
+        q.items.push([el, label]);
+    };
+    const scan = (node) => {
+        if (node.nodeType === 3) { consider(node.parentElement); return; }
+        if (node.nodeType !== 1) return;
+        consider(node);
+        for (const el of node.querySelectorAll(q.css)) consider(el);
+    };
+    q.observer = new MutationObserver(muts => { for (const m of muts) for (const n of m.addedNodes) scan(n); });
+    q.observer.observe(scope, {childList: true, subtree: true});
+    scan(scope);
+    queues[key] = q;
+    installed = true;
+}
+const hits = [];
+while (q.items.length && hits.length < limit) {
+    const [el, label] = q.items.shift();
+    const hit = el.isConnected && fbdHit(el, label);
+    if (hit) hits.push(hit);
+}
+// Prefetch: bring the list's tail into view so infinite scroll loads the next chunk while Python works
+// through this batch; the observer queues the new rows as they render. Clicks don't need the viewport.
+let prefetched = false;
+const now = performance.now();
+if (lowWater && q.items.length < lowWater && !(now - (q.lastPrefetch || -1e9) < prefetchMs)) {
+    q.lastPrefetch = now;
+    const tail = q.scope === document.documentElement ? null : q.scope.lastElementChild;
+    if (tail) tail.scrollIntoView({block: 'end'});
+    else window.scrollTo(0, document.documentElement.scrollHeight);
+    prefetched = true;
+}
+return {installed: installed, hits: hits, pending: q.items.length, prefetched: prefetched};
+"""
+
+def reset_item_queue():
+    """Drop the in-page observers so the next drain re-seeds from a full scan (once per pass)."""
+    driver.execute_script("for (const q of Object.values(window.__fbdQueues || {})) q.observer.disconnect(); window.__fbdQueues = {};")
+
+def drain_item_queue(sel, page, limit=ITEM_QUEUE_BATCH, settle=ITEM_QUEUE_SETTLE):
+    """Up to limit new controls from the in-page observer queue; the learned best label gets its own queue first."""
+    preferred = preferred_selector(sel)
+    if preferred:
+        hits = _drain_item_queue(preferred, page, limit, 0)
+        if hits:
+            record_selector_hits(sel, hits)
+            return hits
+    hits = _drain_item_queue(sel, page, limit, settle)
+    if hits:
+        if preferred:
+            record_alternative(selector_stats_key(sel), preferred.labels[0], False)
+        record_selector_hits(sel, hits)
+    return hits
+
+def _drain_item_queue(sel, page, limit, settle):
+    key = f"{page}|{'|'.join(sel.labels)}"
+    drain = lambda scope: driver.execute_script(
+        ITEM_QUEUE_JS, sel.spec, scope, key, limit, PREFETCH_LOW_WATER, PREFETCH_INTERVAL_MS
+    )
+    scope = list_scope(page)
+    try:
+        result = drain(scope)
+    except StaleElementReferenceException:
+        scope = list_scope(page, refresh=True)
+        result = drain(scope)
+    if result["installed"] and not result["hits"] and scope is not None and discover_elements(sel.spec):
+        widen_scope(page)
+        reset_item_queue()
+        result = drain(None)
+    if not result["hits"] and settle:
+        # The drain above already scrolled for the next chunk; give it a moment to render before calling the list empty
+        wait(settle)
+        result = drain(list_scope(page))
+    return result["hits"]
+
+# One in-page action: click the item's control, wait for its confirm dialog (MutationObserver, no polling),
+# confirm, then wait until the item's row leaves the DOM or a removal toast appears. Times are ms from the click.
+ACTION_RESULT_JS = """
+const actions = window.__fbdActions || {};
+const result = actions[arguments[0]] || null;
+if (result) delete actions[arguments[0]];
+return result;
+"""
+
+ACTION_JS = JS_HELPERS + """
+const [specs, key, confirmSpecs, dialogMs, goneMs, toastLabels, token, callback] = arguments;
+// As an async script the callback gets the outcome; tab workers start it and poll window.__fbdActions instead
+const actions = window.__fbdActions = window.__fbdActions || {};
+const done = callback || (result => { actions[token] = result; });
+const t0 = performance.now();
+const ms = () => Math.round(performance.now() - t0);
+const out = {clicked: false, confirmed: false, removed: false, verified_by: null, confirm_label: null, t_dialog: null, t_confirm: null, t_removed: null};
+const finish = () => { out.t_total = ms(); done(out); };
+const el = fbdResolve(specs, key);
+if (!el || !el.isConnected || !fbdHit(el, '')) { finish(); return; }
+const item = el.closest("[role='listitem'], [role='article'], [role='row'], li, tr");
+// Live regions already on screen only count once their text changes, so a lingering toast from the last item can't verify this one
+const toastCss = "[role='alert'], [role='status']";
+const toastsBefore = new Map([...document.querySelectorAll(toastCss)].map(t => [t, t.innerText]));
+const toastSeen = () => [...document.querySelectorAll(toastCss)].some(t => {
+    const text = (t.innerText || '').toLowerCase();
+    return toastsBefore.get(t) !== t.innerText && toastLabels.some(l => text.includes(l));
+});
+// Only a detached row or a new removal toast verifies; the control alone can close, re-render or relabel
+const removal = () => (item && !item.isConnected) ? 'detached' : toastSeen() ? 'toast' : null;
+const removed = how => { out.removed = true; out.verified_by = how; out.t_removed = ms(); };
+const findConfirm = () => {
+    const overlays = document.querySelectorAll("[role='dialog'], [role='alertdialog'], [role='menu']");
+    if (!overlays.length) return null;
+    const root = overlays[overlays.length - 1];
+    for (const spec of confirmSpecs) {
+        const tags = fbdTags(spec);
+        for (const c of root.querySelectorAll(Object.keys(tags).join(','))) {
+            const label = fbdLabel(tags, c);
+            if (c !== el && label && fbdHit(c, label)) return [c, label];
+        }
+    }
+    return null;
+};
+const waitFor = (test, timeout, cb) => {
+    const first = test();
+    if (first) { cb(first); return; }
+    let timer = null;
+    const obs = new MutationObserver(() => {
+        const v = test();
+        if (v) { obs.disconnect(); clearTimeout(timer); cb(v); }
+    });
+    obs.observe(document.body, {childList: true, subtree: true, characterData: true});
+    timer = setTimeout(() => { obs.disconnect(); cb(null); }, timeout);
+};
+const awaitGone = () => waitFor(removal, goneMs, how => {
+    if (how) removed(how);
+    finish();
+});
+el.click();
+out.clicked = true;
+if (!confirmSpecs.length) { awaitGone(); return; }
+// With a confirm step, wait for the dialog alone; removal is only judged after confirming (or once the dialog wait runs out)
+waitFor(findConfirm, dialogMs, r => {
+    if (r) {
+        out.t_dialog = ms();
+        r[0].click();
+        out.confirmed = true;
+        out.confirm_label = r[1];
+        out.t_confirm = ms();
+    }
+    awaitGone();
+});
+"""
+
+def act_on_item(hit, action_sel, confirm_sel=None, floor=ACTION_FLOOR):
+    """Click, confirm and verify one item; True only when its row detached or a removal toast appeared."""
+    confirm_specs = []
+    preferred = None
+    if confirm_sel:
+        preferred = preferred_selector(confirm_sel)
+        confirm_specs = [sel.spec for sel in (preferred, confirm_sel) if sel]
+    args = (ACTION_JS, action_sel.spec, hit["key"], confirm_specs, ACTION_DIALOG_MS, ACTION_GONE_MS, TOAST_LABELS)
+    # One async call normally; a tab worker polls so the other tabs get the browser while it waits
+    if getattr(tab_local, "handle", None) is None:
+        result = driver.execute_async_script(*args, None)
+    else:
+        token = f"{hit['key']}:{time.monotonic_ns()}"
+        driver.execute_script(*args, token)
+        # Background tabs throttle timers, so allow some slack past the in-page deadlines
+        deadline = time.time() + (ACTION_DIALOG_MS + ACTION_GONE_MS) / 1000 + 5
+        result = driver.execute_script(ACTION_RESULT_JS, token)
+        while result is None and time.time() < deadline:
+            tab_sleep(ACTION_POLL)
+            result = driver.execute_script(ACTION_RESULT_JS, token)
+    if result is None:
+        action_outcomes["unverified"] += 1
+        return False
+    if not result["clicked"]:
+        action_outcomes["gone before click"] += 1
+        return False
+    action_outcomes[f"verified ({result['verified_by']})" if result["removed"] else "unverified"] += 1
+    if result["confirm_label"]:
+        if preferred and result["confirm_label"] not in preferred.labels:
+            record_alternative(selector_stats_key(confirm_sel), preferred.labels[0], False)
+        record_selector_hits(confirm_sel, [{"label": result["confirm_label"]}])
+    for name in ("t_dialog", "t_confirm", "t_removed", "t_total"):
+        if result.get(name) is not None:
+            stats = action_times.setdefault(name, [0, 0, 0])
+            stats[0] += 1
+            stats[1] += result[name]
+            stats[2] = max(stats[2], result[name])
+    base, spread = floor
+    rest = max(1.0, base + random.random() * spread) - result["t_total"] / 1000
+    if rest > 0:
+        wait(rest)
+    return result["removed"]
+
+def report_action_times():
+    if action_outcomes:
+        append_action("Item actions: " + ", ".join(f"{n} {what}" for what, n in action_outcomes.most_common()) + ".", "cyan")
+    for name, (count, total, worst) in action_times.items():
+        append_action(f"Item action {name[2:]}: avg {total/count:.0f}ms, max {worst}ms over {count} items.", "cyan")
+
+def discover_confirm(sel):
+    """Confirm buttons in the newest dialog only; the label that confirmed before goes first."""
+    hits = find_ranked(sel, lambda s: discover_actionables(s.spec, DIALOG_SCOPE))
+    return [hit["el"] for hit in hits]
+
+BULK_SELECT_JS = """
+const [scope, allLabels] = arguments;
+const root = scope || document;
+const boxCss = "[role='checkbox'], input[type='checkbox']";
+const visible = b => { const r = b.getBoundingClientRect(); return r.width && r.height; };
+const checked = b => b.getAttribute('aria-checked') === 'true' || b.checked === true;
+const labelOf = b => (b.getAttribute('aria-label') || (b.closest('label') || b.parentElement || b).innerText || '').trim();
+const all = [...document.querySelectorAll(boxCss)].filter(visible).find(b => allLabels.includes(labelOf(b)));
+if (all) {
+    if (!checked(all)) all.click();
+} else {
+    for (const b of root.querySelectorAll(boxCss)) if (visible(b) && !checked(b)) b.click();
+}
+"""
+
+# Remember the rows whose checkbox is ticked now; only these rows detaching later counts as a bulk removal
+BULK_MARK_JS = JS_HELPERS + """
+const [scope, allLabels] = arguments;
+const rows = [];
+for (const b of (scope || document).querySelectorAll("[role='checkbox'][aria-checked='true'], input[type='checkbox']:checked")) {
+    if (allLabels.includes((b.getAttribute('aria-label') || '').trim())) continue;
+    const row = b.closest("[role='listitem'], [role='article'], [role='row'], li, tr");
+    if (row && !rows.includes(row)) rows.push(row);
+}
+window.__fbdBulkRows = rows;
+return rows.map(row => ({key: fbdBaseKey(row, 'bulk')}));
+"""
+
+BULK_GONE_JS = "return (window.__fbdBulkRows || []).filter(row => !row.isConnected).length;"
+
+def bulk_select_loaded():
+    """Tick every loaded row with the log's multi-select; returns the ticked rows as keyed hits for a ProgressGuard."""
+    invalidate_scope()
+    driver.execute_script(BULK_SELECT_JS, list_scope("activity"), BULK_SELECT_ALL_LABELS)
+    random_wait(0.5, 1)
+    return driver.execute_script(BULK_MARK_JS, list_scope("activity"), BULK_SELECT_ALL_LABELS) or []
+
+def bulk_delete_selected(subsection):
+    """Trash the ticked rows through the list toolbar; how many detached, or None when bulk doesn't work here."""
+    toolbar = driver.execute_script(SCOPE_JS, BULK_TOOLBAR_SELECTORS)
+    if toolbar is None:
+        return None
+    spec = SELECTORS.get("activity", "bulk_action", subsection).spec
+    hits = [hit for hit in discover_actionables(spec, toolbar) if not hit["in_item"] and not hit["in_link"]]
+    if not hits:
+        return None
+    RATE_BUDGET.take()
+    hits[0]["el"].click()
+    random_wait(1, 2)
+    confirm_btns = discover_confirm(SELECTORS.get("activity", "confirm", subsection))
+    if confirm_btns:
+        confirm_btns[0].click()
+    wait_for_page_ready("activity")
+    random_wait(1, 1.5)
+    removed = driver.execute_script(BULK_GONE_JS)
+    return removed or None
+
+def load_pass_history():
+    global pass_history
+    pass_history = load_json(PASS_HISTORY_FILE)
+    return pass_history
+
+def save_pass_history():
+    save_json(PASS_HISTORY_FILE, pass_history)
+
+def remember_passes(key, yields):
+    pass_history[key] = learned_deltas["passes"][key] = yields
+
+def flush_learned():
+    """Save learned state; a fleet worker sends its deltas to the coordinator instead."""
+    if LEARNED_SINK:
+        if any(learned_deltas.values()):
+            LEARNED_SINK({kind: dict(delta) for kind, delta in learned_deltas.items()})
+    else:
+        save_selector_stats()
+        save_pass_history()
+    for delta in learned_deltas.values():
+        delta.clear()
+
+def merge_learned(deltas):
+    """Fold a fleet worker's deltas into this process's tables (saved by the coordinator's flush_learned)."""
+    for key, names in deltas.get("stats", {}).items():
+        for name, (hits, misses) in names.items():
+            counts = selector_stats.setdefault(key, {}).setdefault(name, [0, 0])
+            counts[0] += hits
+            counts[1] += misses
+    pass_history.update(deltas.get("passes", {}))
+    nav = deltas.get("nav", {})
+    for key, url in nav.items():
+        if url:
+            nav_table[key] = url
+        else:
+            nav_table.pop(key, None)
+    if nav:
+        save_nav_table()
+
+def pass_plan(key, passes):
+    """Passes worth running for key: one more than last run's productive passes, capped at passes."""
+    history = pass_history.get(key)
+    if not history:
+        return passes
+    return max(1, min(passes, sum(1 for y in history if y) + 1))
+
+def another_pass(key, pass_num, passes, yielded, scan):
+    """Stop on an empty pass, go on after a big one, otherwise the learned plan and a rescan decide."""
+    if pass_num >= passes or not yielded:
+        return False
+    if yielded >= PASS_MIN_YIELD:
+        return True
+    if pass_num >= pass_plan(key, passes):
+        return False
+    return bool(scan())
+
+def date_slice_url(url, year, month=None):
+    parts = urlparse(url)
+    query = {k: v for k, v in parse_qs(parts.query).items() if k not in ("year", "month")}
+    query["year"] = [str(year)]
+    if month:
+        query["month"] = [str(month)]
+    return parts._replace(query=urlencode(query, doseq=True)).geturl()
+
+def date_slices():
+    """(year, months) newest first; months is [None] in year mode."""
+    today = datetime.now()
+    for year in range(today.year, DATE_SLICE_FROM_YEAR - 1, -1):
+        if DATE_SLICE_MODE == "year":
+            yield year, [None]
+        else:
+            yield year, [m for m in range(12, 0, -1) if (year, m) <= (today.year, today.month)]
+
+# The log shows an active date filter as a chip/button outside the rows, e.g. "2019" or "May 2019"
+DATE_CHIP_JS = """
+const needles = arguments[0];
+const root = document.querySelector("[role='main']") || document;
+const css = "[role='button'], [role='tab'], [role='combobox'], [aria-pressed], [aria-selected='true'], [aria-checked='true']";
+for (const el of root.querySelectorAll(css)) {
+    if (el.closest("[role='listitem'], [role='article'], [role='row'], li, tr")) continue;
+    const text = (el.innerText || '') + ' ' + (el.getAttribute('aria-label') || '');
+    if (needles.every(alts => alts.some(alt => text.includes(alt)))) return true;
+}
+return false;
+"""
+
+LIST_FINGERPRINT_JS = JS_HELPERS + """
+const root = arguments[0] || document;
+return [...root.querySelectorAll("[role='listitem'], [role='article'], [role='row'], li, tr")]
+    .slice(0, 10).map(row => fbdBaseKey(row, 'fp')).join('|');
+"""
+
+def list_fingerprint(refresh=False):
+    try:
+        return driver.execute_script(LIST_FINGERPRINT_JS, list_scope("activity", refresh))
+    except StaleElementReferenceException:
+        return driver.execute_script(LIST_FINGERPRINT_JS, list_scope("activity", True))
+
+def open_date_slice(url, year, month=None, baseline=""):
+    """Load one date slice: "filtered", "unfiltered" (same rows as baseline) or "not ready"."""
+    target = date_slice_url(url, year, month)
+    if not open_page("activity", target) and not wait_for_page_ready("activity"):
+        return "not ready"
+    needles = [[str(year)]]
+    if month:
+        name = datetime(year, month, 1).strftime("%B")
+        needles.append([name, name[:3]])
+    if driver.execute_script(DATE_CHIP_JS, needles):
+        return "filtered"
+    return "unfiltered" if list_fingerprint() == baseline else "filtered"
 
 @error_with_retry
-def delete_all_in_subsection(section, subsection, idx, passes=3):
+def delete_all_in_subsection(section, subsection, idx, passes=3, max_items=None, reverse=False, cursor=None):
+    """Action every item in a subsection; with max_items, stop early and report "more" so the rest can be requeued."""
     global progress_count
+    totals = {"deleted": 0, "cursor": cursor}
     append_action(f"[{section} > {subsection}] Navigating...", "magenta")
     random_wait(1.5, 2)
     try:
-        go_to_activity_log()
-        random_wait(1.5, 2)
-        sub_xpath = subsection_xpath(subsection)
-        found = False
-        for _ in range(3):
-            try:
-                subnav = driver.find_elements(By.XPATH, sub_xpath)
-                if subnav:
-                    driver.execute_script("arguments[0].scrollIntoView(true);", subnav[0])
-                    subnav[0].click()
-                    found = True
-                    break
-                time.sleep(1.5)
-            except Exception as e:
-                append_error(f"delete_all_in_subsection nav error: {e} line {sys.exc_info()[-1].tb_lineno}")
-                continue
-        if not found:
+        if not open_subsection(section, subsection):
             append_action(f"[WARN] Subsection '{subsection}' not found. Skipping.", "yellow")
-            return
-        random_wait(2, 2)
-        for pass_num in range(1, passes+1):
-            items_deleted = 0
-            while True:
-                for _ in range(10):
-                    if not IS_RUNNING or IS_PAUSED:
-                        time.sleep(0.5)
-                action_xpath = subsection_action_xpath(subsection)
-                delete_buttons = driver.find_elements(By.XPATH, action_xpath)
-                if not delete_buttons:
-                    break
-                for btn in delete_buttons:
-                    try:
-                        driver.execute_script("arguments[0].scrollIntoView(true);", btn)
-                        btn.click()
-                        random_wait(1, 2)
-                        confirm_btns = driver.find_elements(By.XPATH, subsection_confirm_xpath())
-                        if confirm_btns:
-                            confirm_btns[0].click()
-                            random_wait(1, 1)
-                        items_deleted += 1
-                        item_delete_counts[(section, subsection)] += 1
-                        append_action(
-                            f"{section} > {subsection}: Actioned item #{item_delete_counts[(section, subsection)]}.", "magenta"
-                        )
-                        random_wait(0.5, 1.2)
-                    except Exception as e:
-                        append_error(f"delete_all_in_subsection item error: {e} line {sys.exc_info()[-1].tb_lineno}")
-                        continue
-            if items_deleted > 0:
-                append_action(f"[{section} > {subsection}] (Pass {pass_num}) {items_deleted} deleted/unliked.", "green")
-            else:
-                append_action(f"[{section} > {subsection}] (Pass {pass_num}) No actionable items.", "yellow")
+            return {"deleted": 0, "more": False}
+        key = nav_key(section, subsection)
+        url = DATE_SLICE_MODE and nav_table.get(key)
+        more = clear_by_date_slices(section, subsection, url, passes, max_items, reverse, totals) if url else None
+        if more is None and reverse:
+            # A helper has no region of its own in the unsliced list; the owner sweeps it
+            append_action(f"[{section} > {subsection}] No date slices to split. Leaving the list to its owner.", "yellow")
+            return {"deleted": totals["deleted"], "more": False}
+        if more is None and url and not open_subsection(section, subsection):
+            return {"deleted": totals["deleted"], "more": False}
+        if more is None:
+            more = clear_loaded_subsection(section, subsection, key, passes, max_items, totals)
+        if more:
+            return {"deleted": totals["deleted"], "more": True, "cursor": totals["cursor"]}
         progress_count += 1
+    except WebDriverException:
+        # A dead session (e.g. killed by the watchdog) must reach error_with_retry so the driver gets replaced
+        if not driver_answers():
+            raise
+        append_error(f"Error deleting/unliking in {section}>{subsection}:\n{traceback.format_exc()}")
     except Exception as e:
         append_error(f"Error deleting/unliking in {section}>{subsection}:\n{traceback.format_exc()}")
-
-@error_with_retry
-def empty_trash(passes=3):
+    return {"deleted": totals["deleted"], "more": False}
+
+def clear_by_date_slices(section, subsection, url, passes, max_items, reverse, totals):
+    """Clear the subsection slice by slice (oldest first when reverse); None means sweep the whole list."""
+    action_sel = SELECTORS.get("activity", "action", subsection)
+    key = nav_key(section, subsection)
+    # The unfiltered list as open_subsection left it; a slice showing the same rows means the filter was ignored
+    baseline = list_fingerprint()
+    if not baseline:
+        return None
+    # A requeued chunk resumes at the slice the last one stopped in (and still owes a sweep for its skipped ones)
+    cursor = totals["cursor"] or {}
+    resume = cursor.get("slice")
+    skipped, unfiltered_years = list(cursor.get("skipped", [])), set()
+
+    def load(year, month, label):
+        """True when the slice loaded, False when it never got ready, None once the filter is clearly ignored."""
+        state = open_date_slice(url, year, month, baseline)
+        if state == "not ready":
+            skipped.append(label)
+            return False
+        if state == "unfiltered":
+            # One year's slices can legitimately start with the whole list's newest rows; two different years can't
+            unfiltered_years.add(year)
+            if len(unfiltered_years) > 1:
+                append_action(f"[{section} > {subsection}] Date filters not honoured here. Processing the whole list.", "yellow")
+                return None
+        return True
+
+    slices = list(date_slices())
+    if reverse:
+        slices = [(year, months[::-1]) for year, months in reversed(slices)]
+    for year, months in slices:
+        if resume:
+            if year != resume[0]:
+                continue
+            months = months[months.index(resume[1]):] if resume[1] in months else months
+            resume = None
+        if months != [None]:
+            loaded = load(year, None, f"{year}")
+            if loaded is None:
+                return None
+            if not loaded or not discover_in_list(action_sel, "activity"):
+                continue
+        for month in months:
+            label = f"{year}" if month is None else f"{year}-{month:02d}"
+            loaded = load(year, month, label)
+            if loaded is None:
+                return None
+            if not loaded:
+                continue
+            append_action(f"[{section} > {subsection}] Slice {label}...", "magenta")
+            totals["cursor"] = {"slice": (year, month), "skipped": skipped}
+            if clear_loaded_subsection(section, subsection, f"{key} @ {label}", passes, max_items, totals):
+                return True
+    if skipped:
+        append_action(f"[{section} > {subsection}] Slices that never loaded: {', '.join(skipped)}. Sweeping the whole list for leftovers.", "yellow")
+        return None
+    return False
+
+def clear_loaded_subsection(section, subsection, key, passes, max_items, totals):
+    """Delete passes over the loaded list; True when max_items was hit and the rest should be requeued."""
+    action_sel = SELECTORS.get("activity", "action", subsection)
+    confirm_sel = SELECTORS.get("activity", "confirm", subsection)
+    reload = driver.current_url
+    yields = []
     for pass_num in range(1, passes+1):
-        driver.get("https://www.facebook.com/me/allactivity/trash")
-        random_wait(3, 2)
         items_deleted = 0
+        bulk_guard = ProgressGuard(f"{section} > {subsection} (bulk)")
+        while BULK_MODE and subsection not in bulk_unsupported:
+            if max_items and totals["deleted"] >= max_items:
+                append_action(f"[{section} > {subsection}] Chunk of {max_items} done. Returning the rest to the queue.", "cyan")
+                return True
+            ticked = bulk_guard.next_batch(bulk_select_loaded())
+            if ticked is None:
+                break
+            if not ticked:
+                continue
+            removed = bulk_delete_selected(subsection)
+            if removed is None:
+                bulk_unsupported.add(subsection)
+                append_action(f"[{section} > {subsection}] No working multi-select here. Using single-item deletion.", "yellow")
+                break
+            items_deleted += removed
+            totals["deleted"] += removed
+            item_delete_counts[(section, subsection)] += removed
+            append_action(f"{section} > {subsection}: Bulk-actioned {removed} items ({item_delete_counts[(section, subsection)]} so far).", "magenta")
+        reset_item_queue()
+        guard = ProgressGuard(f"{section} > {subsection}", escalate=lambda: open_page("activity", reload))
         while True:
-            delete_buttons = driver.find_elements(By.XPATH, "//span[contains(text(),'Delete')]")
-            if not delete_buttons:
+            while (IS_RUNNING and IS_PAUSED) or (FLEET_PAUSE and FLEET_PAUSE.is_set()):
+                wait(0.5)
+            delete_buttons = guard.next_batch(drain_item_queue(action_sel, "activity"))
+            if delete_buttons is None:
                 break
             for btn in delete_buttons:
+                if max_items and totals["deleted"] >= max_items:
+                    append_action(f"[{section} > {subsection}] Chunk of {max_items} done. Returning the rest to the queue.", "cyan")
+                    return True
                 try:
-                    driver.execute_script("arguments[0].scrollIntoView(true);", btn)
-                    btn.click()
-                    random_wait(1, 2)
-                    confirm_btns = driver.find_elements(By.XPATH, "//span[contains(text(),'Delete') or contains(text(),'Confirm')]")
-                    if confirm_btns:
-                        confirm_btns[0].click()
-                        random_wait(1, 1)
+                    RATE_BUDGET.take()
+                    if not act_on_item(btn, action_sel, confirm_sel):
+                        continue
                     items_deleted += 1
-                    append_action(f"Trash: deleted item #{items_deleted}.", "red")
+                    totals["deleted"] += 1
+                    item_delete_counts[(section, subsection)] += 1
+                    append_action(
+                        f"{section} > {subsection}: Actioned item #{item_delete_counts[(section, subsection)]}.", "magenta"
+                    )
                 except Exception as e:
-                    append_error(f"empty_trash item error: {e} line {sys.exc_info()[-1].tb_lineno}")
+                    append_error(f"delete_all_in_subsection item error: {e} line {sys.exc_info()[-1].tb_lineno}")
                     continue
         if items_deleted > 0:
-            append_action(f"Trash emptied. Deleted {items_deleted} items this pass.", "green")
+            append_action(f"[{section} > {subsection}] (Pass {pass_num}) {items_deleted} deleted/unliked.", "green")
         else:
-            append_action("Trash already empty this pass.", "yellow")
-
-@error_with_retry
-def clear_archive(passes=3):
+            append_action(f"[{section} > {subsection}] (Pass {pass_num}) No actionable items.", "yellow")
+        yields.append(items_deleted)
+        if not another_pass(key, pass_num, passes, items_deleted, lambda: discover_in_list(action_sel, "activity")):
+            break
+    remember_passes(key, yields)
+    return False
+
+def sweep(name, passes=1):
+    """Run one SWEEP_PAGES spec; returns the number of verified removals."""
+    spec = SWEEP_PAGES[name]
+    page = spec["page"]
+    action_sel = SELECTORS.get(page, "action")
+    confirm_sel = SELECTORS.get(page, "confirm") if spec["confirm"] else None
+    floor = PACING[spec["pacing"]]
+    started, total, yields = time.time(), 0, []
     for pass_num in range(1, passes+1):
-        driver.get("https://www.facebook.com/me/allactivity/archive")
-        random_wait(3, 2)
-        items_deleted = 0
+        open_page(page, spec["url"])
+        guard = ProgressGuard(spec["title"], escalate=lambda: open_page(page, spec["url"]))
+        removed = 0
         while True:
-            delete_buttons = driver.find_elements(By.XPATH, "//span[contains(text(),'Delete') or contains(text(),'Remove')]")
-            if not delete_buttons:
+            batch = guard.next_batch(drain_item_queue(action_sel, page))
+            if batch is None:
                 break
-            for btn in delete_buttons:
+            for hit in batch:
                 try:
-                    driver.execute_script("arguments[0].scrollIntoView(true);", btn)
-                    btn.click()
-                    random_wait(1, 2)
-                    confirm_btns = driver.find_elements(By.XPATH, "//span[contains(text(),'Delete') or contains(text(),'Confirm')]")
-                    if confirm_btns:
-                        confirm_btns[0].click()
-                        random_wait(1, 1)
-                    items_deleted += 1
-                    append_action(f"Archive: deleted item #{items_deleted}.", "red")
+                    if not act_on_item(hit, action_sel, confirm_sel, floor):
+                        continue
+                    removed += 1
+                    total += 1
+                    msg, color = spec["item"]
+                    append_action(msg.format(n=removed if "pass" in spec else total), color)
                 except Exception as e:
-                    append_error(f"clear_archive item error: {e} line {sys.exc_info()[-1].tb_lineno}")
+                    append_error(f"sweep {name} item error: {e} line {sys.exc_info()[-1].tb_lineno}")
                     continue
-        if items_deleted > 0:
-            append_action(f"Archive cleared. Deleted {items_deleted} items this pass.", "green")
-        else:
-            append_action("Archive already clear this pass.", "yellow")
+        yields.append(removed)
+        if "pass" in spec:
+            done_msg, empty_msg = spec["pass"]
+            if removed:
+                append_action(done_msg.format(n=removed), "green")
+            else:
+                append_action(empty_msg, "yellow")
+        if spec["termination"] != "converge" or not another_pass(name, pass_num, passes, removed, lambda: discover_in_list(action_sel, page)):
+            break
+    if spec["termination"] == "converge":
+        remember_passes(name, yields)
+    elapsed = time.time() - started
+    if "summary" in spec:
+        msg, color = spec["summary"]
+        append_action(msg.format(n=total), color)
+    append_action(f"{spec['title']}: {total} removed in {elapsed:.0f}s ({total * 60 / max(elapsed, 1):.1f}/min).", "cyan")
+    return total
+
+@error_with_retry
+def empty_trash(passes=3):
+    sweep("trash", passes)
+
+@error_with_retry
+def clear_archive(passes=3):
+    sweep("archive", passes)
 
 def permanently_empty_trash():
-    driver.get("https://www.facebook.com/me/allactivity/trash")
-    random_wait(2, 2)
-    total_deleted = 0
-    while True:
-        delete_buttons = driver.find_elements(By.XPATH, "//span[contains(text(),'Delete')]")
-        if not delete_buttons:
-            break
-        for btn in delete_buttons:
-            try:
-                driver.execute_script("arguments[0].scrollIntoView(true);", btn)
-                btn.click()
-                random_wait(1, 2)
-                confirm_btns = driver.find_elements(By.XPATH, "//span[contains(text(),'Delete') or contains(text(),'Confirm')]")
-                if confirm_btns:
-                    confirm_btns[0].click()
-                    random_wait(1, 1)
-                total_deleted += 1
-                append_action(f"PERMANENTLY deleted trash item #{total_deleted}.", "bold red")
-            except Exception as e:
-                append_error(f"permanently_empty_trash item error: {e} line {sys.exc_info()[-1].tb_lineno}")
-                continue
-    append_action(f"ALL TRASH PERMANENTLY DELETED. Total: {total_deleted}", "bold red")
+    sweep("trash_burn")
 
 if __name__ == "__main__":
     try: